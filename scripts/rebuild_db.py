@@ -4,6 +4,7 @@ import re
 import yaml
 from pathlib import Path
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 # Add project root to path
 sys.path.append(str(Path(__file__).resolve().parents[1]))
@@ -14,6 +15,23 @@ from src.infrastructure.db.repository import MediaRepository, SymlinkRepository
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# Rows written per transaction. One commit per row is fsync-bound on a NAS,
+# one commit per chunk keeps memory bounded while still batching the I/O.
+BATCH_SIZE = 1000
+
+_TMDB_ID = re.compile(r"\{tmdb-(\d+)\}")
+_TMDB_SUFFIX = re.compile(r"\s*\{tmdb-\d+\}")
+_YEAR_SUFFIX = re.compile(r"\s*\((\d{4})\)$")
+# Whole "Title (EnTitle) (Year) {tmdb-ID}" in one pass. The titles may not
+# contain brackets and a bare "(1234)" is always read as the year, so anything
+# ambiguous fails to match and goes through the step-by-step parser below.
+_FOLDER_RE = re.compile(
+    r"^(?P<cn>[^(){}\s][^(){}]*?)"
+    r"(?:\s*\((?P<en>(?!\d{4}\))[^(){}]+)\))?"
+    r"(?:\s*\((?P<year>\d{4})\))?"
+    r"(?:\s*\{tmdb-(?P<tmdb>\d+)\})?$"
+)
+
 def load_config(config_path="config.yaml"):
     with open(config_path, "r", encoding="utf-8") as f:
         return yaml.safe_load(f)
@@ -23,19 +41,32 @@ def parse_folder_name(folder_name):
     Parses "Title (EnTitle) (Year) {tmdb-ID}"
     Returns (title_cn, title_en, year, tmdb_id)
     """
+    m = _FOLDER_RE.match(folder_name)
+    if m:
+        title_cn, title_en, year, tmdb = m.group("cn", "en", "year", "tmdb")
+        if title_en is not None:
+            title_cn, title_en = title_cn.strip(), title_en.strip()
+        return (
+            title_cn,
+            title_en,
+            int(year) if year else None,
+            int(tmdb) if tmdb else None,
+        )
+
     # Extract TMDB ID
-    tmdb_match = re.search(r"\{tmdb-(\d+)\}", folder_name)
+    tmdb_match = _TMDB_ID.search(folder_name)
     tmdb_id = int(tmdb_match.group(1)) if tmdb_match else None
     
     # Remove TMDB ID part
-    remaining = re.sub(r"\s*\{tmdb-\d+\}", "", folder_name)
+    remaining = _TMDB_SUFFIX.sub("", folder_name)
     
     # Extract Year
-    year_match = re.search(r"\((\d{4})\)$", remaining)
+    year_match = _YEAR_SUFFIX.search(remaining)
     year = int(year_match.group(1)) if year_match else None
     
     # Remove Year part
-    remaining = re.sub(r"\s*\(\d{4}\)$", "", remaining)
+    if year_match:
+        remaining = remaining[:year_match.start()]
     
     # Extract Titles
     # Format: "CN (EN)" or just "CN"
@@ -54,6 +85,49 @@ def parse_folder_name(folder_name):
     
     return title_cn, title_en, year, tmdb_id
 
+def _list_dir(path):
+    with os.scandir(path) as it:
+        return list(it)
+
+def _scan_links(link_dir, media_type, title_cn, title_en, year, tmdb_id):
+    """
+    Returns a media_mapping record for every symlink in link_dir.
+    Paths stay plain strings; no Path objects are built per link.
+    """
+    results = []
+    for entry in _list_dir(link_dir):
+        if entry.is_symlink():
+            results.append({
+                "original_path": os.readlink(entry.path),
+                "target_path": entry.path,
+                "media_type": media_type,
+                "title_cn": title_cn,
+                "title_en": title_en,
+                "tmdb_id": tmdb_id,
+                "year": year,
+                "search_status": "found"
+            })
+    return results
+
+def scan_movie_dir(item_dir):
+    title_cn, title_en, year, tmdb_id = parse_folder_name(item_dir.name)
+    if not tmdb_id:
+        logger.warning(f"Skipping non-standard folder: {item_dir.name}")
+        return []
+    return _scan_links(item_dir.path, "Movie", title_cn, title_en, year, tmdb_id)
+
+def scan_show_dir(item_dir):
+    title_cn, title_en, year, tmdb_id = parse_folder_name(item_dir.name)
+    if not tmdb_id:
+        logger.warning(f"Skipping non-standard folder: {item_dir.name}")
+        return []
+    # TV Shows have Season folders
+    results = []
+    for season_dir in _list_dir(item_dir.path):
+        if season_dir.is_dir():
+            results.extend(_scan_links(season_dir.path, "TV Show", title_cn, title_en, year, tmdb_id))
+    return results
+
 def rebuild(config_path="config.yaml"):
     config = load_config(config_path)
     target_dir = Path(config["target_dir"])
@@ -62,78 +136,48 @@ def rebuild(config_path="config.yaml"):
     logger.info(f"Target Dir: {target_dir}")
     logger.info(f"Database: {db_path}")
     
-    db = Database(db_path)
+    # A rebuild can always be rerun, so trade crash safety for speed when the
+    # share cannot do WAL.
+    db = Database(db_path, wal_fallback="MEMORY")
     media_repo = MediaRepository(db)
     symlink_repo = SymlinkRepository(db)
     
     count = 0
-    
-    # Process Movies
-    movies_dir = target_dir / "Movies"
-    if movies_dir.exists():
-        for item_dir in movies_dir.iterdir():
-            if not item_dir.is_dir():
-                continue
-                
-            title_cn, title_en, year, tmdb_id = parse_folder_name(item_dir.name)
-            if not tmdb_id:
-                logger.warning(f"Skipping non-standard folder: {item_dir.name}")
-                continue
-                
-            for file_path in item_dir.iterdir():
-                if file_path.is_symlink():
-                    original_path = Path(os.readlink(file_path))
-                    
-                    # Insert into DB
-                    media_repo.save({
-                        "original_path": str(original_path),
-                        "target_path": str(file_path),
-                        "media_type": "Movie",
-                        "title_cn": title_cn,
-                        "title_en": title_en,
-                        "tmdb_id": tmdb_id,
-                        "year": year,
-                        "search_status": "found"
-                    })
-                    symlink_repo.add(original_path, file_path)
-                    count += 1
-                    logger.info(f"Recovered Movie: {title_cn} -> {original_path.name}")
+    pending = []
 
-    # Process TV Shows
-    tv_dir = target_dir / "TV Shows"
-    if tv_dir.exists():
-        for item_dir in tv_dir.iterdir():
-            if not item_dir.is_dir():
-                continue
-                
-            title_cn, title_en, year, tmdb_id = parse_folder_name(item_dir.name)
-            if not tmdb_id:
-                logger.warning(f"Skipping non-standard folder: {item_dir.name}")
+    def flush():
+        if not pending:
+            return
+        with db.transaction():
+            media_repo.save_many(list(pending))
+            symlink_repo.add_many([(r["original_path"], r["target_path"]) for r in pending])
+        pending.clear()
+
+    # Directory listing on a NAS is latency bound, so item folders are
+    # scanned concurrently. os.scandir reports entry types from the listing
+    # itself, saving a stat per entry. DB writes stay on this thread.
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    sections = [
+        (target_dir / "Movies", scan_movie_dir, "Recovered Movie"),
+        (target_dir / "TV Shows", scan_show_dir, "Recovered TV Episode"),
+    ]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for section_dir, scan_item_dir, label in sections:
+            if not section_dir.exists():
                 continue
-                
-            # TV Shows have Season folders
-            for season_dir in item_dir.iterdir():
-                if not season_dir.is_dir():
-                    continue
-                    
-                for file_path in season_dir.iterdir():
-                    if file_path.is_symlink():
-                        original_path = Path(os.readlink(file_path))
-                        
-                        media_repo.save({
-                            "original_path": str(original_path),
-                            "target_path": str(file_path),
-                            "media_type": "TV Show",
-                            "title_cn": title_cn,
-                            "title_en": title_en,
-                            "tmdb_id": tmdb_id,
-                            "year": year,
-                            "search_status": "found"
-                        })
-                        symlink_repo.add(original_path, file_path)
-                        count += 1
-                        logger.info(f"Recovered TV Episode: {title_cn} -> {original_path.name}")
+            item_dirs = [entry for entry in _list_dir(section_dir) if entry.is_dir()]
+            for results in executor.map(scan_item_dir, item_dirs):
+                for record in results:
+                    pending.append(record)
+                    if len(pending) >= BATCH_SIZE:
+                        flush()
+                    count += 1
+                    logger.info(
+                        f"{label}: {record['title_cn']} -> "
+                        f"{os.path.basename(record['original_path'])}"
+                    )
 
+    flush()
     logger.info(f"Rebuild complete. Recovered {count} items.")
 
 if __name__ == "__main__":
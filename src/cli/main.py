@@ -1,7 +1,10 @@
 # Copyright (c) 2025 Trae AI. All rights reserved.
 
 import typer
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from pathlib import Path
+from typing import Dict, Optional
 from rich.console import Console
 from rich.table import Table
 from rich.progress import Progress
@@ -11,14 +14,51 @@ from ..core.aggregator import Aggregator
 from ..core.classifier import Classifier
 from ..core.renamer import Renamer
 from ..core.linker import Linker
+from ..core.models import MediaItem, MediaType
 from ..db.manager import DatabaseManager
 
 app = typer.Typer(help="NAS Infuse Helper - Organize your media files for Infuse.")
 console = Console()
 
+# Concurrent TMDB lookups in link_items
+SEARCH_WORKERS = 8
+
 
 from ..core.searcher import Searcher
 
+
+def _known_verdict(item: MediaItem, known: Dict[str, Dict]) -> Optional[Dict]:
+    """
+    Returns the stored verdict if every file of the item was already found
+    and linked under the same TMDB entry, None otherwise. A new file in the
+    folder makes the item unknown again.
+    """
+    if not item.files:
+        return None
+    rows = [known.get(str(f.path)) for f in item.files]
+    if None in rows or rows[0]["tmdb_id"] is None:
+        return None
+    if len({row["tmdb_id"] for row in rows}) != 1:
+        return None
+    return rows[0]
+
+
+def _apply_verdict(item: MediaItem, row: Dict, searcher: Searcher) -> MediaItem:
+    item.title_cn = row["title_cn"]
+    item.title_en = row["title_en"]
+    item.tmdb_id = row["tmdb_id"]
+    item.year = row["year"]
+    item.alias = row["alias"]
+    try:
+        item.media_type = MediaType(row["media_type"])
+    except ValueError:
+        pass
+    # Searcher.search would also have filled in the season from the name
+    if item.season is None:
+        item.season = searcher.extract_season_from_name(item.name)
+    item.search_status = "found"
+    return item
+
 # ... existing code ...
 
 @app.command("list")
@@ -51,15 +91,22 @@ def list_items(config_path: str = "config.yaml", search: bool = False):
     table.add_column("Search Status", style="cyan")
     table.add_column("Suggested Name", style="yellow")
 
+    items = [classifier.classify(item) for item in items]
+    if searcher:
+        try:
+            items = searcher.search_many(items, max_workers=SEARCH_WORKERS)
+        finally:
+            searcher.close()
+
+    video_extensions = classifier.video_extensions
     for item in items:
-        item = classifier.classify(item)
-        if searcher:
-            item = searcher.search(item)
-        
-        video_files = [f for f in item.files if classifier.is_video(f)]
+        # Only the first video is needed; stop at it instead of filtering all
+        first_video = next(
+            (f for f in item.files if f.extension.lower() in video_extensions), None
+        )
         suggested_path = ""
-        if video_files:
-            suggested_path = str(renamer.get_suggested_path(item, video_files[0]))
+        if first_video:
+            suggested_path = str(renamer.get_suggested_path(item, first_video))
 
         table.add_row(
             item.name,
@@ -106,31 +153,51 @@ def link_items(config_path: str = "config.yaml", dry_run: bool = False, search:
     # Sort items by earliest mtime to preserve import order for Infuse
     items.sort(key=lambda x: x.earliest_mtime)
 
-    with Progress() as progress:
+    # Items whose files were all found and linked by an earlier run reuse
+    # the stored verdict instead of being classified and searched again.
+    known = db_manager.list_found() if searcher else {}
+    verdicts = [_known_verdict(item, known) for item in items]
+    items = [
+        _apply_verdict(item, row, searcher) if row else classifier.classify(item)
+        for item, row in zip(items, verdicts)
+    ]
+
+    def search(pair):
+        item, row = pair
+        return item if row else searcher.search(item)
+
+    with Progress() as progress, ExitStack() as stack:
         task = progress.add_task("[green]Linking...", total=len(items))
 
+        # TMDB lookups are network bound: submit them all up front and
+        # consume the results in import order while renaming.
+        if searcher:
+            # Closed after the pool below has finished its searches
+            stack.callback(searcher.close)
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers=SEARCH_WORKERS))
+            items = executor.map(search, zip(items, verdicts))
+
         total_links = 0
         unknown_items = 0
+        # DB rows are collected across items and written with one executemany
+        pending_mappings = []
+        pending_links = []
         for item in items:
-            item = classifier.classify(item)
-            if searcher:
-                item = searcher.search(item)
-
             # Record in DB regardless of success
             if searcher and item.search_status != "found":
                 unknown_items += 1
                 # If not found or uncertain, we still record but maybe with no target path
                 if not dry_run:
-                    db_manager.add_mapping(
-                        item.original_path,
-                        None,
-                        item.media_type.value,
-                        title_cn=item.title_cn,
-                        title_en=item.title_en,
-                        tmdb_id=item.tmdb_id,
-                        year=item.year,
-                        search_status=item.search_status,
-                    )
+                    pending_mappings.append({
+                        "original": item.original_path,
+                        "target": None,
+                        "media_type": item.media_type.value,
+                        "title_cn": item.title_cn,
+                        "title_en": item.title_en,
+                        "tmdb_id": item.tmdb_id,
+                        "year": item.year,
+                        "search_status": item.search_status,
+                    })
                 progress.update(task, advance=1)
                 continue
 
@@ -142,20 +209,27 @@ def link_items(config_path: str = "config.yaml", dry_run: bool = False, search:
             if not dry_run:
                 # Update DB with full info when linking
                 for file, suggested_path in suggested_mappings:
-                    db_manager.add_mapping(
-                        file.path,
-                        suggested_path,
-                        item.media_type.value,
-                        title_cn=item.title_cn,
-                        title_en=item.title_en,
-                        tmdb_id=item.tmdb_id,
-                        year=item.year,
-                        search_status=item.search_status,
-                    )
-                total_links += linker.link_item(item, suggested_mappings)
+                    pending_mappings.append({
+                        "original": file.path,
+                        "target": suggested_path,
+                        "media_type": item.media_type.value,
+                        "title_cn": item.title_cn,
+                        "title_en": item.title_en,
+                        "tmdb_id": item.tmdb_id,
+                        "year": item.year,
+                        "search_status": item.search_status,
+                    })
+                pending_links.append((item, suggested_mappings))
 
             progress.update(task, advance=1)
 
+        if not dry_run:
+            db_manager.add_mappings(pending_mappings)
+            # Link after the bulk insert; the linker only updates target_path
+            # and media_type, so the metadata written above is kept
+            for item, suggested_mappings in pending_links:
+                total_links += linker.link_item(item, suggested_mappings)
+
     if dry_run:
         console.print("[yellow]Dry run completed. No links created.[/yellow]")
     else:
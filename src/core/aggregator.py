@@ -1,11 +1,32 @@
 # Copyright (c) 2025 Trae AI. All rights reserved.
 
+from functools import lru_cache
 from pathlib import Path
 import re
 from typing import Dict, List, Optional
 
 from .models import MediaFile, MediaItem
-from pypinyin import lazy_pinyin
+
+# Compiled once at import; these run for every scanned file.
+_EP_MARKER = re.compile(r'([sS]\d+[eE]\d+|EP\d+)', re.IGNORECASE)
+_YEAR = re.compile(r'\b(19[89]\d|20\d{2})\b')
+_CLEAN_EP = re.compile(r'[sS]\d+|[eE]\d+|EP\d+', re.IGNORECASE)
+_SEP = re.compile(r'[._-]')
+_SUBTITLE_LANG = re.compile(r"\.[a-z]{2,3}$", re.IGNORECASE)
+
+
+@lru_cache(maxsize=4096)
+def _pinyin_key(prefix: str) -> str:
+    """
+    Pinyin of a cleaned prefix token. Episodes of one show share the same
+    token, so most calls are cache hits.
+    """
+    # pypinyin passes ASCII through unchanged; skip it (and its ~150ms of
+    # dictionary loading at import) unless a name actually needs it.
+    if prefix.isascii():
+        return prefix.lower()
+    from pypinyin import lazy_pinyin
+    return "".join(lazy_pinyin(prefix)).lower()
 
 
 class Aggregator:
@@ -25,110 +46,96 @@ class Aggregator:
         Gets the Pinyin of the first few words to group similar titles.
         """
         # Clean name from SxxExx/EPxx before pinyin
-        clean_name = re.sub(r'[sS]\d+|[eE]\d+|EP\d+', '', name, flags=re.IGNORECASE).strip()
+        clean_name = _CLEAN_EP.sub('', name).strip()
         # Remove separators
-        clean_name = re.sub(r'[._-]', ' ', clean_name).strip()
+        clean_name = _SEP.sub(' ', clean_name).strip()
         # Take first part before space
         prefix = clean_name.split(' ')[0]
-        return "".join(lazy_pinyin(prefix)).lower()
+        return _pinyin_key(prefix)
 
     def _extract_episode_markers(self, name: str) -> Optional[str]:
         """
         Detects EPxx or SxxExx patterns.
         """
-        match = re.search(r'([sS]\d+[eE]\d+|EP\d+)', name, re.IGNORECASE)
+        match = _EP_MARKER.search(name)
         return match.group(1) if match else None
 
     def _get_year(self, name: str) -> Optional[int]:
-        match = re.search(r'\b(19[89]\d|20\d{2})\b', name)
+        match = _YEAR.search(name)
         return int(match.group(1)) if match else None
 
     def aggregate(self, files: List[MediaFile]) -> List[MediaItem]:
         """
         Groups files by their logical content.
         """
-        # Step 1: Initial grouping by top-level folder
-        top_level_groups: Dict[Path, List[MediaFile]] = {}
-        for media_file in files:
+        # Step 0: Per-file attributes as parallel lists (index i <-> files[i]).
+        # Names, subtitle flags, episode markers and years are computed in one
+        # bulk pass each, and the grouping below only moves integer indices.
+        names = [f.path.name for f in files]
+        is_subtitle = [f.extension.lower() in self.subtitle_extensions for f in files]
+        has_marker = [
+            not sub and _EP_MARKER.search(name) is not None
+            for name, sub in zip(names, is_subtitle)
+        ]
+        years = [
+            None if sub else self._get_year(name)
+            for name, sub in zip(names, is_subtitle)
+        ]
+
+        # Step 1: Initial grouping by top-level folder.
+        top_level_groups: Dict[Path, List[int]] = {}
+        for i, media_file in enumerate(files):
             try:
                 rel_path = media_file.path.relative_to(self.source_root)
                 if len(rel_path.parts) == 1:
                     base_name = media_file.path.stem
-                    if media_file.extension.lower() in self.subtitle_extensions:
-                        base_name = re.sub(r"\.[a-z]{2,3}$", "", base_name, flags=re.IGNORECASE)
+                    if is_subtitle[i]:
+                        base_name = _SUBTITLE_LANG.sub("", base_name)
                     item_root = self.source_root / base_name
                 else:
                     top_level_name = rel_path.parts[0]
                     item_root = self.source_root / top_level_name
-                if item_root not in top_level_groups:
-                    top_level_groups[item_root] = []
-                top_level_groups[item_root].append(media_file)
             except ValueError:
                 continue
+            top_level_groups.setdefault(item_root, []).append(i)
 
-        final_items: List[MediaItem] = []
+        # Step 2: Build items and, in the same pass, merge TV Shows with the
+        # same Pinyin prefix. If two MediaItems have SxxExx/EPxx and their
+        # names have same Pinyin prefix, merge them.
+        merged_items: Dict[str, MediaItem] = {}
+        standalone_items: List[MediaItem] = []
 
-        for item_root, item_files in top_level_groups.items():
-            content_files = [
-                f for f in item_files if f.extension.lower() not in self.subtitle_extensions
-            ]
+        for item_root, indices in top_level_groups.items():
+            content = [i for i in indices if not is_subtitle[i]]
             # Check for "Movie Series" inside a folder
             # Criteria: Multiple files, none have season markers, but they have different years
-            has_season_markers = any(
-                self._extract_episode_markers(f.path.name) for f in content_files
-            )
-            years = {
-                self._get_year(f.path.name) for f in content_files if self._get_year(f.path.name)
-            }
+            has_season_markers = any(has_marker[i] for i in content)
+            group_years = {years[i] for i in content if years[i]}
             
-            if not has_season_markers and len(years) > 1 and len(content_files) > 1:
+            if not has_season_markers and len(group_years) > 1 and len(content) > 1:
                 # Treat each file as a separate Movie MediaItem
-                for f in content_files:
-                    final_items.append(MediaItem(
+                for i in content:
+                    f = files[i]
+                    standalone_items.append(MediaItem(
                         name=f.path.stem,
                         original_path=f.path,
                         files=[f]
                     ))
                 continue
 
-            # Check for different TV shows mixed in same folder or separate folders that are actually same show
-            # (Grouped by Pinyin of prefix)
-            if has_season_markers:
-                # This folder is definitely a TV show, but might need to be grouped with others
-                # For now, we keep top-level folders as units unless requested otherwise
-                # But we handle the "Hei Jing" vs "黑镜" grouping if they were separate folders
-                pass
-            
             # Default: one folder = one item
             representative_path = item_root
-            if not item_root.exists() and item_files:
-                video_candidates = [
-                    f
-                    for f in item_files
-                    if f.extension.lower() not in self.subtitle_extensions
-                ]
-                representative_path = (
-                    (video_candidates[0].path if video_candidates else item_files[0].path)
-                )
-            final_items.append(MediaItem(
+            if not item_root.exists():
+                representative_path = files[content[0] if content else indices[0]].path
+            item = MediaItem(
                 name=item_root.name,
                 original_path=representative_path,
-                files=item_files,
-            ))
-
-        # Step 2: Global grouping for TV Shows with same Pinyin prefix
-        # If two MediaItems have SxxExx/EPxx and their names have same Pinyin prefix, merge them.
-        merged_items: Dict[str, MediaItem] = {}
-        standalone_items: List[MediaItem] = []
-
-        for item in final_items:
-            content_files = [
-                f for f in item.files if f.extension.lower() not in self.subtitle_extensions
-            ]
-            has_tv_marker = any(
-                self._extract_episode_markers(f.path.name) for f in content_files
+                files=[files[i] for i in indices],
             )
-            if has_tv_marker:
+
+            if has_season_markers:
+                # This folder is definitely a TV show; group it with other
+                # folders of the same show (e.g. "Hei Jing" vs "黑镜")
                 pinyin_key = self._get_pinyin_prefix(item.name)
                 if pinyin_key in merged_items:
                     merged_items[pinyin_key].files.extend(item.files)
@@ -138,4 +145,8 @@ class Aggregator:
             else:
                 standalone_items.append(item)
 
-        return list(merged_items.values()) + standalone_items
+        items = list(merged_items.values()) + standalone_items
+        # Files are final now; cache earliest_mtime for the import-order sort
+        for item in items:
+            item.refresh_earliest_mtime()
+        return items
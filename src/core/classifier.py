@@ -4,6 +4,20 @@ import re
 from typing import List
 from .models import MediaItem, MediaType, MediaFile
 
+# Common patterns for TV episodes: S01E01, E01, EP01, 第01集, etc.
+# Combined into one alternation so each filename is scanned once
+# instead of once per pattern.
+_EPISODE_PATTERN = re.compile(
+    r"[Ss]\d+[Ee]\d+"  # S01E01
+    r"|[Ee][Pp]?\d+"  # E01, EP01
+    r"|第\s*\d+\s*[集话期]"  # 第01集
+    r"|\[\d+\]"  # [01]
+    r"|\s\d{1,3}\s"  # Space separated number
+)
+
+# Season folders: "Season 1", "S01", "第1季", "第2部"
+_SEASON_PATTERN = re.compile(r"\b(?:Season|S)\s*\d+\b|第\s*\d+\s*[季部]", re.IGNORECASE)
+
 
 class Classifier:
     """
@@ -12,18 +26,13 @@ class Classifier:
 
     def __init__(self, video_extensions: List[str]):
         self.video_extensions = {ext.lower() for ext in video_extensions}
-        # Common patterns for TV episodes: S01E01, E01, EP01, 第01集, etc.
-        self.episode_patterns = [
-            re.compile(r"[Ss](\d+)[Ee](\d+)"),  # S01E01
-            re.compile(r"[Ee][Pp]?(\d+)"),  # E01, EP01
-            re.compile(r"第\s*(\d+)\s*[集话期]"),  # 第01集
-            re.compile(r"\[(\d+)\]"),  # [01]
-            re.compile(r"\s(\d{1,3})\s"),  # Space separated number
-        ]
 
     def is_video(self, file: MediaFile) -> bool:
         return file.extension.lower() in self.video_extensions
 
+    def _is_episode_name(self, name: str) -> bool:
+        return _EPISODE_PATTERN.search(name) is not None
+
     def classify(self, item: MediaItem) -> MediaItem:
         video_files = [f for f in item.files if self.is_video(f)]
 
@@ -33,23 +42,21 @@ class Classifier:
             item.media_type = MediaType.MOVIE
             return item
 
-        path_parts = list(reversed(item.original_path.parts))
-        start_idx = 1 if item.original_path.is_file() else 0
-        
-        for part in path_parts[start_idx:]:
-            if re.search(r'\b(Season|S)\s*\d+\b', part, re.IGNORECASE) or \
-               re.search(r'第\s*\d+\s*[季部]', part):
-                item.media_type = MediaType.TV_SHOW
-                break
+        # Any directory in the path named like a season marks a TV show.
+        # The file name itself (if the item is a single file) is not a folder.
+        path_parts = item.original_path.parts
+        if item.original_path.is_file():
+            path_parts = path_parts[:-1]
+
+        if any(_SEASON_PATTERN.search(part) for part in path_parts):
+            item.media_type = MediaType.TV_SHOW
 
         if len(video_files) > 1:
             # Check if multiple files look like episodes
             episode_count = 0
             for f in video_files:
-                for pattern in self.episode_patterns:
-                    if pattern.search(f.path.name):
-                        episode_count += 1
-                        break
+                if self._is_episode_name(f.path.name):
+                    episode_count += 1
 
             if episode_count > 1:
                 item.media_type = MediaType.TV_SHOW
@@ -63,27 +70,14 @@ class Classifier:
             # If not already detected as TV Show via folder, check file name
             if item.media_type != MediaType.TV_SHOW:
                 f = video_files[0]
-                is_episode = False
-                for pattern in self.episode_patterns:
-                    if pattern.search(f.path.name):
-                        is_episode = True
-                        break
-                
-                if is_episode:
+                if self._is_episode_name(f.path.name):
                     item.media_type = MediaType.TV_SHOW
                 else:
                     item.media_type = MediaType.MOVIE
         else:
             if item.media_type == MediaType.TV_SHOW:
                 return item
-            is_episode = False
-            for f in item.files:
-                for pattern in self.episode_patterns:
-                    if pattern.search(f.path.name):
-                        is_episode = True
-                        break
-                if is_episode:
-                    break
+            is_episode = any(self._is_episode_name(f.path.name) for f in item.files)
             item.media_type = MediaType.TV_SHOW if is_episode else MediaType.MOVIE
 
         return item
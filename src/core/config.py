@@ -15,6 +15,8 @@ class Config(BaseModel):
     server_port: int = 5000
     server_host: str = "0.0.0.0"
     scan_interval_minutes: int = 60
+    max_background_workers: int = 4
+    match_workers: int = 4
     path_mapping: Optional[Dict[str, str]] = None
     verbose: bool = False
 
@@ -3,6 +3,7 @@
 import os
 from pathlib import Path
 from .models import MediaItem, MediaFile
+from .path_mapping import PathMapper
 from ..db.manager import DatabaseManager
 
 
@@ -15,6 +16,7 @@ class Linker:
         self.target_root = target_root
         self.db_manager = db_manager
         self.path_mapping = path_mapping or {}
+        self._mapper = PathMapper(self.path_mapping)
 
     def link_file(self, source_path: Path, relative_target_path: Path, media_type: str):
         """
@@ -22,24 +24,14 @@ class Linker:
         """
         full_target_path = self.target_root / relative_target_path
 
-        # Apply path mapping to source_path if configured
-        target_source = str(source_path)
-        if self.path_mapping:
-            for old_prefix, new_prefix in self.path_mapping.items():
-                if target_source.startswith(old_prefix):
-                    target_source = target_source.replace(old_prefix, new_prefix, 1)
-                    break
-        
         # Ensure target directory exists
         full_target_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Remove existing link/file if it exists
-        if full_target_path.exists() or full_target_path.is_symlink():
-            full_target_path.unlink()
-
         try:
-            os.symlink(target_source, full_target_path)
-            self.db_manager.add_mapping(source_path, full_target_path, media_type)
+            self._create_link(source_path, full_target_path)
+            self.db_manager.record_links(
+                [{"original": source_path, "target": full_target_path, "media_type": media_type}]
+            )
             return True
         except Exception as e:
             print(f"Error creating symlink for {source_path}: {e}")
@@ -49,9 +41,78 @@ class Linker:
         """
         Links all files in a MediaItem to their suggested paths.
         suggested_paths should be a list of (MediaFile, Path) tuples.
+
+        Files are linked as one batch: each distinct parent directory is
+        created once, and the DB rows for all links are written together.
+        """
+        targets = [
+            (file.path, self.target_root / suggested_path)
+            for file, suggested_path in suggested_paths
+        ]
+        # One open descriptor per parent directory lets unlink/symlink skip
+        # resolving the full target path again for every file.
+        parent_fds = {}
+        linked = []
+        try:
+            for source_path, full_target_path in targets:
+                parent = full_target_path.parent
+                if parent not in parent_fds:
+                    parent.mkdir(parents=True, exist_ok=True)
+                    parent_fds[parent] = self._open_dir(parent)
+                try:
+                    self._create_link(source_path, full_target_path, parent_fds[parent])
+                    linked.append(
+                        {
+                            "original": source_path,
+                            "target": full_target_path,
+                            "media_type": item.media_type.value,
+                        }
+                    )
+                except Exception as e:
+                    print(f"Error creating symlink for {source_path}: {e}")
+        finally:
+            for fd in parent_fds.values():
+                if fd is not None:
+                    os.close(fd)
+
+        try:
+            self.db_manager.record_links(linked)
+        except Exception as e:
+            print(f"Error recording links for {item.name}: {e}")
+            return 0
+        return len(linked)
+
+    def _create_link(self, source_path: Path, full_target_path: Path, dir_fd: int = None):
+        """
+        Replaces whatever is at full_target_path with a symlink to source_path.
+        The parent directory must already exist. If dir_fd is an open
+        descriptor of that directory, the link is created relative to it.
         """
-        success_count = 0
-        for file, suggested_path in suggested_paths:
-            if self.link_file(file.path, suggested_path, item.media_type.value):
-                success_count += 1
-        return success_count
+        # Apply path mapping to source_path if configured
+        target_source = self._mapper.apply(str(source_path))
+
+        # Remove existing link/file if it exists (one syscall, also covers broken links)
+        if dir_fd is None:
+            try:
+                os.unlink(full_target_path)
+            except FileNotFoundError:
+                pass
+            os.symlink(target_source, full_target_path)
+        else:
+            try:
+                os.unlink(full_target_path.name, dir_fd=dir_fd)
+            except FileNotFoundError:
+                pass
+            os.symlink(target_source, full_target_path.name, dir_fd=dir_fd)
+
+    @staticmethod
+    def _open_dir(path: Path):
+        """
+        Opens a directory descriptor for *at() syscalls, or None where unsupported.
+        """
+        if os.symlink not in os.supports_dir_fd or os.unlink not in os.supports_dir_fd:
+            return None
+        try:
+            return os.open(path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+        except OSError:
+            return None
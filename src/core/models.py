@@ -1,9 +1,14 @@
 # Copyright (c) 2025 Trae AI. All rights reserved.
 
+import os
+import sys
+from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 from typing import List, Optional
-from pydantic import BaseModel, Field
+
+# __slots__ drops the per-instance __dict__; dataclass(slots=True) needs 3.10+.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 class MediaType(Enum):
@@ -12,9 +17,11 @@ class MediaType(Enum):
     UNKNOWN = "Unknown"
 
 
-class MediaFile(BaseModel):
+@dataclass(frozen=True, **_SLOTS)
+class MediaFile:
     """
     Represents a single file on disk.
+    Immutable, so it is hashable and can key caches and sets.
     """
 
     path: Path
@@ -22,15 +29,30 @@ class MediaFile(BaseModel):
     size: int = 0  # In bytes, though mock files are 0
     mtime: float = 0.0
 
+    @classmethod
+    def from_path(cls, path: Path, extension: Optional[str] = None) -> "MediaFile":
+        """
+        Builds a MediaFile from one stat() call.
+        Missing or unreadable files get size and mtime 0.
+        """
+        if extension is None:
+            extension = path.suffix
+        try:
+            st = os.stat(path)
+        except (OSError, ValueError):
+            return cls(path=path, extension=extension)
+        return cls(path=path, extension=extension, size=st.st_size, mtime=st.st_mtime)
+
 
-class MediaItem(BaseModel):
+@dataclass(**_SLOTS)
+class MediaItem:
     """
     Represents a logical media entry (e.g., a movie or a TV show).
     """
 
     name: str
     original_path: Path  # Root path of this item
-    files: List[MediaFile] = Field(default_factory=list)
+    files: List[MediaFile] = field(default_factory=list)
     media_type: MediaType = MediaType.UNKNOWN
     title_cn: Optional[str] = None
     title_en: Optional[str] = None
@@ -39,11 +61,20 @@ class MediaItem(BaseModel):
     alias: Optional[str] = None
     search_status: str = "pending"  # pending, found, not_found, uncertain
     suggested_name: Optional[str] = None
+    season: Optional[int] = None
+    episode: Optional[int] = None
+    _earliest_mtime: Optional[float] = field(default=None, init=False, repr=False, compare=False)
 
     @property
     def earliest_mtime(self) -> float:
-        if not self.files:
-            return 0.0
-        return min(f.mtime for f in self.files)
-    season: Optional[int] = None
-    episode: Optional[int] = None
+        if self._earliest_mtime is not None:
+            return self._earliest_mtime
+        return min((f.mtime for f in self.files), default=0.0)
+
+    def refresh_earliest_mtime(self) -> float:
+        """
+        Computes earliest_mtime once and caches it.
+        Call again after changing files.
+        """
+        self._earliest_mtime = min((f.mtime for f in self.files), default=0.0)
+        return self._earliest_mtime
@@ -0,0 +1,40 @@
+# Copyright (c) 2025 Trae AI. All rights reserved.
+
+import re
+from typing import Dict, Optional
+
+
+class PathMapper:
+    """
+    Rewrites path prefixes according to a {old_prefix: new_prefix} mapping.
+    All prefixes are compiled into one regex, longest first, so each lookup
+    is a single match and the most specific prefix wins.
+    """
+
+    def __init__(self, mapping: Optional[Dict[str, str]] = None):
+        self.mapping = dict(mapping or {})
+        self._pattern = None
+        if self.mapping:
+            prefixes = sorted(self.mapping, key=len, reverse=True)
+            self._pattern = re.compile("|".join(re.escape(p) for p in prefixes))
+
+    @classmethod
+    def reuse(cls, mapper: Optional["PathMapper"], mapping: Optional[Dict[str, str]]) -> "PathMapper":
+        """
+        Returns mapper if it was built from an equal mapping, else a new one,
+        so callers can follow config changes without recompiling per path.
+        """
+        if mapper is not None and mapper.mapping == dict(mapping or {}):
+            return mapper
+        return cls(mapping)
+
+    def apply(self, path: str) -> str:
+        """
+        Returns path with its matching prefix replaced, or path unchanged.
+        """
+        if self._pattern is None:
+            return path
+        match = self._pattern.match(path)
+        if match is None:
+            return path
+        return self.mapping[match.group(0)] + path[match.end():]
@@ -1,97 +1,134 @@
 # Copyright (c) 2025 Trae AI. All rights reserved.
 
+import os
 import re
-from pathlib import Path
+from functools import lru_cache
+from pathlib import Path, PurePosixPath
 from typing import Optional, Tuple
 from .models import MediaItem, MediaType, MediaFile
 
+# clean_name patterns, compiled once. The release tags are one alternation so
+# a name is scanned once instead of once per tag; "4K 超清" stays ahead of "4K".
+_BRACKETS = re.compile(r"\[[^\]\n]*\]")
+_YEAR = re.compile(r"[\(\.]\d{4}[\)\.]")
+_TAGS = re.compile(
+    "|".join([
+        r"1080[pi]",
+        r"2160[pi]",
+        r"720[pi]",
+        r"4[kK]\s*超清",
+        r"4[kK]",
+        r"AVC",
+        r"HEVC",
+        r"H264",
+        r"H265",
+        r"x264",
+        r"x265",
+        r"BluRay",
+        r"BDRIP",
+        r"WEB-DL",
+    ]),
+    re.IGNORECASE,
+)
 
-class Renamer:
+# Characters Samba/Windows reject: slashes and colons become dashes, the
+# rest and all control characters are dropped.
+_SAMBA_TABLE = str.maketrans({
+    ":": "-",
+    "/": "-",
+    "\\": "-",
+    "?": None,
+    "*": None,
+    "<": None,
+    ">": None,
+    '"': None,
+    "|": None,
+    **{chr(i): None for i in range(32)},
+})
+
+# "Season N" folder names, shared instead of formatted per file
+_SEASON_DIRS = tuple(f"Season {i}" for i in range(64))
+
+_SUBTITLE_EXTENSIONS = frozenset({".srt", ".ass", ".ssa", ".sub", ".vtt"})
+_SUBTITLE_LANG = re.compile(r"\.([a-z]{2,3})\.(srt|ass|ssa|sub|vtt)$", re.IGNORECASE)
+
+# Episode patterns, tried in order
+_TV_PATTERNS = (
+    re.compile(r"[Ss](\d+)[Ee](\d+)"),  # S01E01
+    re.compile(r"EP?(\d+)", re.IGNORECASE),  # E01, EP01
+    re.compile(r"第\s*(\d+)\s*[集话期]"),  # 第01集
+    re.compile(r"\[(\d+)\]"),  # [01]
+)
+_SE_PATTERN = _TV_PATTERNS[0]
+_EPISODE_ONLY_PATTERNS = _TV_PATTERNS[1:]
+# All of the above in one alternation, used to skip or short-circuit them
+_ANY_EPISODE = re.compile(
+    r"(?P<se>[Ss](?P<season>\d+)[Ee](?P<episode>\d+))"
+    r"|EP?\d+"
+    r"|第\s*\d+\s*[集话期]"
+    r"|\[\d+\]",
+    re.IGNORECASE,
+)
+_SEASON_PATTERNS = (
+    re.compile(r"Season\s*(\d+)", re.IGNORECASE),
+    re.compile(r"S(\d+)", re.IGNORECASE),
+)
+
+
+def _sanitize_for_samba(name: str) -> str:
+    # Colon: " - " when followed by a space, otherwise a plain dash
+    name = name.replace(": ", " - ")
+    # Everything else is a per-character mapping: one C-level pass
+    return name.translate(_SAMBA_TABLE).strip()
+
+
+def _clean_name(name: str) -> str:
+    # Remove common brackets like [1080P], [BDRIP], etc.
+    cleaned = _BRACKETS.sub("", name)
+    # Remove year like (2019) or .2019.
+    cleaned = _YEAR.sub(" ", cleaned)
+    # Remove common resolution and encoding tags
+    cleaned = _TAGS.sub(" ", cleaned)
+
+    # Replace dots, underscores and dashes with spaces. Chained replace()
+    # is ~10x faster here than translate() with a dict table.
+    cleaned = cleaned.replace(".", " ").replace("_", " ").replace("-", " ")
+    # Collapse runs of whitespace and trim, without entering the regex engine
+    return " ".join(cleaned.split())
+
+
+@lru_cache(maxsize=4096)
+def _clean_and_sanitize(name: str) -> str:
     """
-    Suggests new names and paths for MediaItems and their files.
+    Folder name for items without TMDB metadata. Cached: rescans and every
+    file of the same folder ask for the same name.
     """
+    return _sanitize_for_samba(_clean_name(name))
 
-    def __init__(self):
-        self.tv_patterns = [
-            re.compile(r"[Ss](\d+)[Ee](\d+)"),  # S01E01
-            re.compile(r"EP?(\d+)", re.IGNORECASE),  # E01, EP01
-            re.compile(r"第\s*(\d+)\s*[集话期]"),  # 第01集
-            re.compile(r"\[(\d+)\]"),  # [01]
-        ]
-        self.season_patterns = [
-            re.compile(r"Season\s*(\d+)", re.IGNORECASE),
-            re.compile(r"S(\d+)", re.IGNORECASE),
-        ]
 
-    def sanitize_for_samba(self, name: str) -> str:
-        """
-        Sanitizes the filename by replacing illegal characters for Samba/Windows compatibility.
-        """
-        # Colon: replace with " - " if surrounded by spaces or text, but simple replacement is easier
-        name = name.replace(": ", " - ")
-        name = name.replace(":", "-")
-        
-        # Slash
-        name = name.replace("/", "-")
-        name = name.replace("\\", "-")
-        
-        # Others
-        name = name.replace("?", "")
-        name = name.replace("*", "")
-        name = name.replace("<", "")
-        name = name.replace(">", "")
-        name = name.replace("\"", "")
-        name = name.replace("|", "")
-        
-        # Remove control characters
-        name = "".join(c for c in name if ord(c) >= 32)
-        
-        return name.strip()
-
-    def clean_name(self, name: str) -> str:
-        """
-        Cleans up the name by removing common tags.
-        """
-        # Remove common brackets like [1080P], [BDRIP], etc.
-        cleaned = re.sub(r"\[.*?\]", "", name)
-        # Remove year like (2019) or .2019.
-        cleaned = re.sub(r"[\(\.]\d{4}[\)\.]", " ", cleaned)
-        # Remove common resolution and encoding tags
-        tags = [
-            r"1080[pi]",
-            r"2160[pi]",
-            r"720[pi]",
-            r"4[kK]\s*超清",
-            r"4[kK]",
-            r"AVC",
-            r"HEVC",
-            r"H264",
-            r"H265",
-            r"x264",
-            r"x265",
-            r"BluRay",
-            r"BDRIP",
-            r"WEB-DL",
-        ]
-        for tag in tags:
-            cleaned = re.sub(tag, " ", cleaned, flags=re.IGNORECASE)
-
-        # Replace dots and underscores with spaces
-        cleaned = cleaned.replace(".", " ").replace("_", " ").replace("-", " ")
-        # Remove multiple spaces
-        cleaned = re.sub(r"\s+", " ", cleaned)
-        return cleaned.strip()
+@lru_cache(maxsize=4096)
+def _episode_info(filename: str) -> Tuple[Optional[int], Optional[int]]:
+    """
+    (season, episode) parsed from a name. Cached: a video and its subtitles,
+    and every episode of a show under the same parent, share inputs.
+    """
+    season, episode = None, None
 
-    def extract_episode_info(self, filename: str) -> Tuple[Optional[int], Optional[int]]:
-        season, episode = None, None
+    # One pass over the name settles the common cases: no episode marker at
+    # all, or an S01E01 that comes before any other kind of marker.
+    first = _ANY_EPISODE.search(filename)
+    if first is not None and first.group("se"):
+        return int(first.group("season")), int(first.group("episode"))
 
-        # Try S01E01 first
-        s_e_match = re.search(r"[Ss](\d+)[Ee](\d+)", filename)
+    if first is not None:
+        # Another marker comes first. The patterns have a fixed priority
+        # regardless of position, so try them in turn.
+        s_e_match = _SE_PATTERN.search(filename)
         if s_e_match:
             return int(s_e_match.group(1)), int(s_e_match.group(2))
 
         # Try episode only
-        for pattern in self.tv_patterns:
+        for pattern in _EPISODE_ONLY_PATTERNS:
             match = pattern.search(filename)
             if match:
                 # If only episode found, assume season 1 for now
@@ -99,74 +136,152 @@ class Renamer:
                 season = 1
                 break
 
-        # Check if season is mentioned in the path
-        for pattern in self.season_patterns:
-            match = pattern.search(filename)
-            if match:
-                season = int(match.group(1))
-                break
+    # Check if season is mentioned in the path
+    for pattern in _SEASON_PATTERNS:
+        match = pattern.search(filename)
+        if match:
+            season = int(match.group(1))
+            break
+
+    return season, episode
+
+
+class Renamer:
+    """
+    Suggests new names and paths for MediaItems and their files.
+    """
 
-        return season, episode
+    def __init__(self):
+        # Suggestions only depend on a handful of scalar fields, and the same
+        # file is typically resolved several times (preview, confirm, link).
+        self._suggest = lru_cache(maxsize=8192)(self._compute_suggested_path)
+        # Folder and title names are per item, shared by all of its files
+        self._item_names = lru_cache(maxsize=1024)(self._compute_item_names)
 
-    def get_suggested_path(self, item: MediaItem, file: MediaFile) -> Path:
+    def sanitize_for_samba(self, name: str) -> str:
+        """
+        Sanitizes the filename by replacing illegal characters for Samba/Windows compatibility.
+        """
+        return _sanitize_for_samba(name)
+
+    def clean_name(self, name: str) -> str:
+        """
+        Cleans up the name by removing common tags.
+        """
+        return _clean_name(name)
+
+    def extract_episode_info(self, filename: str) -> Tuple[Optional[int], Optional[int]]:
+        return _episode_info(filename)
+
+    def get_suggested_path(self, item: MediaItem, file: MediaFile) -> PurePosixPath:
         """
         Returns the suggested relative path for a file.
+        Components are sanitized (no slashes), so the path is built as one
+        string; join it onto the target root to get a concrete Path.
+        """
+        return self._suggest(
+            item.title_cn,
+            item.title_en,
+            item.year,
+            item.tmdb_id,
+            item.name,
+            item.media_type,
+            item.season,
+            item.episode,
+            file.path,
+            file.extension,
+        )
+
+    def _compute_item_names(
+        self,
+        title_cn: Optional[str],
+        title_en: Optional[str],
+        year: Optional[int],
+        tmdb_id: Optional[int],
+        name: str,
+    ) -> Tuple[str, Optional[str]]:
+        """
+        Returns (item folder name, sanitized English title or None).
         """
         # Priority: Search results (Chinese + English + Year) > Original name
-        if item.title_cn:
-            display_name = item.title_cn
-            if item.title_en and item.title_en != item.title_cn:
-                display_name += f" ({item.title_en})"
-            if item.year:
-                display_name += f" ({item.year})"
-            if item.tmdb_id:
-                display_name += f" {{tmdb-{item.tmdb_id}}}"
+        if title_cn:
+            display_name = title_cn
+            if title_en and title_en != title_cn:
+                display_name += f" ({title_en})"
+            if year:
+                display_name += f" ({year})"
+            if tmdb_id:
+                display_name += f" {{tmdb-{tmdb_id}}}"
             clean_item_name = self.sanitize_for_samba(display_name)
         else:
-            clean_item_name = self.sanitize_for_samba(self.clean_name(item.name))
+            clean_item_name = _clean_and_sanitize(name)
 
-        if item.media_type == MediaType.MOVIE:
-            return Path("Movies") / clean_item_name / self.sanitize_for_samba(file.path.name)
+        clean_title_en = self.sanitize_for_samba(title_en) if title_en else None
+        return clean_item_name, clean_title_en
 
-        if item.media_type == MediaType.TV_SHOW:
-            season = item.season
-            episode = item.episode
+    def _compute_suggested_path(
+        self,
+        title_cn: Optional[str],
+        title_en: Optional[str],
+        year: Optional[int],
+        tmdb_id: Optional[int],
+        name: str,
+        media_type: MediaType,
+        season: Optional[int],
+        episode: Optional[int],
+        file_path: Path,
+        extension: str,
+    ) -> PurePosixPath:
+        clean_item_name, clean_title_en = self._item_names(
+            title_cn, title_en, year, tmdb_id, name
+        )
+        # Read once; every branch below needs the file name
+        file_name = file_path.name
 
-            extracted_season, extracted_episode = self.extract_episode_info(file.path.name)
+        if media_type == MediaType.MOVIE:
+            return PurePosixPath(
+                f"Movies/{clean_item_name}/{self.sanitize_for_samba(file_name)}"
+            )
+
+        if media_type == MediaType.TV_SHOW:
+            extracted_season, extracted_episode = self.extract_episode_info(file_name)
             final_season = extracted_season if extracted_season is not None else season
             final_episode = extracted_episode if extracted_episode is not None else episode
 
             if final_season is None or final_episode is None:
-                parent_season, parent_episode = self.extract_episode_info(str(file.path.parent))
+                # Siblings share this string, so _episode_info's cache
+                # parses each directory once
+                parent_dir = os.path.dirname(str(file_path))
+                parent_season, parent_episode = self.extract_episode_info(parent_dir)
                 final_season = final_season or parent_season or 1
                 final_episode = final_episode or parent_episode
 
-            season_str = f"Season {final_season if final_season else 1}"
+            season_number = final_season if final_season else 1
+            if season_number < len(_SEASON_DIRS):
+                season_str = _SEASON_DIRS[season_number]
+            else:
+                season_str = f"Season {season_number}"
 
             if final_episode is None:
-                return Path("TV Shows") / clean_item_name / season_str / self.sanitize_for_samba(
-                    file.path.name
+                return PurePosixPath(
+                    f"TV Shows/{clean_item_name}/{season_str}/"
+                    f"{self.sanitize_for_samba(file_name)}"
                 )
 
-            s_e_part = f"S{final_season if final_season else 1:02d}E{final_episode:02d}"
-            is_subtitle = file.extension.lower() in [".srt", ".ass", ".ssa", ".sub", ".vtt"]
-            suffix = file.extension
+            s_e_part = f"S{season_number:02d}E{final_episode:02d}"
+            suffix = extension
 
-            if is_subtitle:
-                lang_match = re.search(
-                    r"\.([a-z]{2,3})\.(srt|ass|ssa|sub|vtt)$",
-                    file.path.name,
-                    re.IGNORECASE,
-                )
+            # Keep the language tag of subtitles, e.g. ".chs.srt"
+            if extension.lower() in _SUBTITLE_EXTENSIONS:
+                lang_match = _SUBTITLE_LANG.search(file_name)
                 if lang_match:
-                    suffix = f".{lang_match.group(1)}{file.extension}"
+                    suffix = f".{lang_match.group(1)}{extension}"
 
-            if item.title_en:
-                clean_title_en = self.sanitize_for_samba(item.title_en)
+            if clean_title_en is not None:
                 new_filename = f"{clean_title_en} {s_e_part}{suffix}"
             else:
                 new_filename = f"{s_e_part}{suffix}"
 
-            return Path("TV Shows") / clean_item_name / season_str / new_filename
+            return PurePosixPath(f"TV Shows/{clean_item_name}/{season_str}/{new_filename}")
 
-        return Path("Unknown") / self.sanitize_for_samba(file.path.name)
+        return PurePosixPath(f"Unknown/{self.sanitize_for_samba(file_name)}")
@@ -1,10 +1,28 @@
 # Copyright (c) 2025 Trae AI. All rights reserved.
 
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import List, Set, Optional
+from typing import Iterator, List, Set, Optional, Tuple
 from .models import MediaFile
 
+# Threads for walking top-level folders concurrently
+_SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def _open_dir(path: str) -> Optional[int]:
+    """
+    Opens a directory descriptor for stat(dir_fd=...), or None where unsupported.
+    """
+    if os.stat not in os.supports_dir_fd:
+        return None
+    try:
+        return os.open(path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    except OSError:
+        return None
+
 
 class Scanner:
     """
@@ -26,28 +44,120 @@ class Scanner:
         """
         Recursively scans the root_path for allowed video and subtitle files.
         """
-        media_files = []
+        return list(self.iter_scan(root_path))
+
+    def iter_scan(self, root_path: Path) -> Iterator[MediaFile]:
+        """
+        Streaming variant of scan(): yields files in the same order without
+        holding the whole library in memory.
+        """
         if not root_path.exists():
-            return media_files
+            return
+
+        # Directory listing on a NAS is latency bound: files directly under
+        # the root are read here, each top-level folder is walked on its own
+        # thread. Only a window of folders is in flight at a time, and they
+        # are yielded in submission order, i.e. the os.walk order.
+        media_files, subdirs = self._scan_dir(str(root_path))
+        yield from media_files
+        if not subdirs:
+            return
+
+        workers = min(len(subdirs), _SCAN_WORKERS)
+        remaining = iter(subdirs)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            in_flight = deque(
+                executor.submit(self._walk_all, subdir)
+                for subdir in islice(remaining, workers * 2)
+            )
+            while in_flight:
+                files = in_flight.popleft().result()
+                for subdir in islice(remaining, 1):
+                    in_flight.append(executor.submit(self._walk_all, subdir))
+                yield from files
+
+    def _walk_all(self, dir_path: str) -> List[MediaFile]:
+        return list(self._walk(dir_path))
+
+    def _walk(self, dir_path: str) -> Iterator[MediaFile]:
+        """
+        Same traversal as os.walk (top-down, files before subdirectories,
+        symlinked directories not followed, unreadable directories skipped).
+        """
+        files, subdirs = self._scan_dir(dir_path)
+        yield from files
+        for subdir in subdirs:
+            yield from self._walk(subdir)
+
+    def _scan_dir(self, dir_path: str) -> Tuple[List[MediaFile], List[str]]:
+        """
+        Lists one directory: returns its media files and the subdirectories
+        to descend into. Works on DirEntry objects, so there is no Path per
+        candidate, no exists() probe, and the extension is read straight off
+        the name.
+        """
+        media_files: List[MediaFile] = []
+        subdirs: List[str] = []
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError:
+            return media_files, subdirs
+
+        candidates = []
+        for entry in entries:
+            name = entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                # Skip blacklisted directories
+                if name not in self.blacklist and not entry.is_symlink():
+                    subdirs.append(entry.path)
+                continue
+
+            if name in self.blacklist:
+                continue
+            # Same rule as Path.suffix: no suffix for ".hidden" or "name."
+            dot = name.rfind(".")
+            if not 0 < dot < len(name) - 1:
+                continue
+            # Include video and subtitle files. Extensions are usually
+            # lowercase on disk already, so only lowercase on a miss.
+            ext = name[dot:]
+            if ext not in self.allowed_extensions:
+                ext = ext.lower()
+                if ext not in self.allowed_extensions:
+                    continue
+            candidates.append((entry, ext))
 
-        for root, dirs, files in os.walk(root_path):
-            # Modify dirs in place to skip blacklisted directories
-            dirs[:] = [d for d in dirs if d not in self.blacklist]
+        if not candidates:
+            return media_files, subdirs
 
-            for file in files:
-                if file in self.blacklist:
+        # stat() relative to an open directory fd, so the kernel resolves the
+        # directory path once instead of once per file.
+        dir_fd = _open_dir(dir_path)
+        try:
+            for entry, ext in candidates:
+                try:
+                    if dir_fd is None:
+                        stat = entry.stat()
+                    else:
+                        stat = os.stat(entry.name, dir_fd=dir_fd)
+                except OSError:
+                    # Dangling symlink or removed since the listing: there is
+                    # nothing to link, so leave it out.
                     continue
-                path = Path(root) / file
-                ext = path.suffix.lower()
-                # Include video and subtitle files
-                if ext in self.allowed_extensions:
-                    stat = path.stat() if path.exists() else None
-                    media_files.append(
-                        MediaFile(
-                            path=path,
-                            extension=ext,
-                            size=stat.st_size if stat else 0,
-                            mtime=stat.st_mtime if stat else 0,
-                        )
+                media_files.append(
+                    MediaFile(
+                        path=Path(entry.path),
+                        extension=ext,
+                        size=stat.st_size,
+                        mtime=stat.st_mtime,
                     )
-        return media_files
+                )
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
+        return media_files, subdirs
@@ -1,6 +1,7 @@
 # Copyright (c) 2025 Trae AI. All rights reserved.
 
 import sqlite3
+import threading
 from pathlib import Path
 from typing import List, Tuple, Optional, Dict
 
@@ -12,10 +13,23 @@ class DatabaseManager:
 
     def __init__(self, db_path: Path):
         self.db_path = db_path
+        # One connection for the whole run: link_item writes once per item,
+        # so reconnecting per call would dominate bulk links.
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
         self._init_db()
 
+    def close(self):
+        self._conn.close()
+
     def _init_db(self):
-        with sqlite3.connect(self.db_path) as conn:
+        conn = self._conn
+        # WAL makes each commit an append; NORMAL sync is safe with WAL.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        with self._lock, conn:
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS media_mapping (
@@ -46,29 +60,79 @@ class DatabaseManager:
         alias: str = None,
         search_status: str = "found",
     ):
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
+        self.add_mappings(
+            [
+                {
+                    "original": original,
+                    "target": target,
+                    "media_type": media_type,
+                    "title_cn": title_cn,
+                    "title_en": title_en,
+                    "tmdb_id": tmdb_id,
+                    "year": year,
+                    "alias": alias,
+                    "search_status": search_status,
+                }
+            ]
+        )
+
+    def add_mappings(self, mappings: List[Dict]):
+        """
+        Inserts several mappings in one executemany call.
+        Each dict takes the same keys as the add_mapping arguments.
+        """
+        if not mappings:
+            return
+        rows = [
+            (
+                str(m["original"]),
+                str(m["target"]) if m.get("target") else None,
+                m.get("media_type"),
+                m.get("title_cn"),
+                m.get("title_en"),
+                m.get("tmdb_id"),
+                m.get("year"),
+                m.get("alias"),
+                m.get("search_status", "found"),
+            )
+            for m in mappings
+        ]
+        with self._lock, self._conn as conn:
+            conn.executemany(
                 """
                 INSERT OR REPLACE INTO media_mapping 
                 (original_path, target_path, media_type, title_cn, title_en, tmdb_id, year, alias, search_status) 
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (
-                    str(original),
-                    str(target) if target else None,
-                    media_type,
-                    title_cn,
-                    title_en,
-                    tmdb_id,
-                    year,
-                    alias,
-                    search_status,
-                ),
+                rows,
+            )
+
+    def record_links(self, links: List[Dict]):
+        """
+        Records created links. Takes "original", "target" and "media_type"
+        keys; an existing row only gets its target_path and media_type
+        updated, so the TMDB metadata stored for it is kept.
+        """
+        if not links:
+            return
+        rows = [
+            (str(link["original"]), str(link["target"]), link.get("media_type"))
+            for link in links
+        ]
+        with self._lock, self._conn as conn:
+            conn.executemany(
+                """
+                INSERT INTO media_mapping (original_path, target_path, media_type, search_status)
+                VALUES (?, ?, ?, 'found')
+                ON CONFLICT(original_path) DO UPDATE SET
+                    target_path = excluded.target_path,
+                    media_type = excluded.media_type
+                """,
+                rows,
             )
 
     def get_mapping(self, original_path: Path) -> Optional[Dict]:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._lock, self._conn as conn:
             cursor = conn.execute(
                 "SELECT * FROM media_mapping WHERE original_path = ?",
                 (str(original_path),),
@@ -76,9 +140,26 @@ class DatabaseManager:
             row = cursor.fetchone()
             return dict(row) if row else None
 
+    def list_found(self) -> Dict[str, Dict]:
+        """
+        Returns the TMDB verdict of every linked, found file keyed by
+        original_path, in a single query. Rows without TMDB data (e.g. links
+        made without searching) are not a verdict and are left out.
+        """
+        with self._lock, self._conn as conn:
+            cursor = conn.execute(
+                """
+                SELECT original_path, media_type, title_cn, title_en, tmdb_id, year, alias
+                FROM media_mapping
+                WHERE search_status = 'found' AND target_path IS NOT NULL
+                AND tmdb_id IS NOT NULL
+                AND (title_cn IS NOT NULL OR title_en IS NOT NULL)
+                """
+            )
+            return {row["original_path"]: dict(row) for row in cursor}
+
     def get_all_mappings(self) -> List[Dict]:
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self._lock, self._conn as conn:
             cursor = conn.execute(
                 "SELECT * FROM media_mapping ORDER BY created_at DESC"
             )
@@ -1,12 +1,49 @@
 # Copyright (c) 2025 Trae AI. All rights reserved.
 
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Optional
 import logging
 
+# Pages between WAL checkpoints (SQLite default 1000); a per-connection setting
+_WAL_AUTOCHECKPOINT = 10000
+
+
+class _Connection(sqlite3.Connection):
+    """
+    sqlite3 connection whose commits can be deferred while a
+    Database.transaction() block is open, so repository methods that
+    commit per call can be grouped into a single transaction.
+    """
+
+    deferred = False
+
+    def commit(self):
+        if not self.deferred:
+            super().commit()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self.deferred:
+            return False
+        return super().__exit__(exc_type, exc_value, traceback)
+
+
 class Database:
-    def __init__(self, db_path: Path):
+    def __init__(self, db_path: Path, wal_fallback: Optional[str] = None):
+        """
+        wal_fallback: journal mode to use when WAL cannot be enabled, e.g. on
+        CIFS/NFS shares without shared-memory support. Defaults to SQLite's
+        own rollback journal.
+        """
         self.db_path = db_path
+        self.wal_fallback = wal_fallback
+        self._local = threading.local()
+        # Per-connection journal mode, only set once WAL turned out unusable
+        self._journal_mode: Optional[str] = None
+        # Set once WAL is enabled; _connect then tunes every new connection
+        self._wal = False
         # Force init if memory, otherwise normal check
         # But wait, we need to create schema even if file exists but table missing?
         # Current logic: only if parent dir missing or memory?
@@ -19,6 +56,12 @@ class Database:
             self.db_path.parent.mkdir(parents=True, exist_ok=True)
 
         with self.get_connection() as conn:
+            # WAL lets readers run alongside the writer and turns each commit
+            # into an append instead of a rollback-journal rewrite.
+            # The setting is persistent, so it only needs to be set once.
+            if str(self.db_path) != ":memory:":
+                self._enable_wal(conn)
+
             # 1. media_mapping table
             conn.execute(
                 """
@@ -76,17 +119,114 @@ class Database:
                 """
             )
 
+            # original_path already has the index behind its UNIQUE constraint;
+            # this one covers symlink lookups by source.
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_symlink_source ON symlink_map(source_path)")
+            # Logs are listed by id, which is the rowid and needs no index
+            conn.execute("DROP INDEX IF EXISTS idx_logs_ts")
+
+    def _enable_wal(self, conn: sqlite3.Connection):
+        try:
+            mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        except sqlite3.OperationalError as e:
+            mode = str(e)
+
+        if str(mode).lower() == "wal":
+            self._wal = True
+            conn.execute(f"PRAGMA wal_autocheckpoint={_WAL_AUTOCHECKPOINT}")
+            return
+
+        logging.warning(f"WAL unavailable for {self.db_path} ({mode})")
+        if self.wal_fallback:
+            # Non-WAL journal modes are per connection, so _connect re-applies it
+            self._journal_mode = self.wal_fallback
+            conn.execute(f"PRAGMA journal_mode={self._journal_mode}")
+
     def get_connection(self):
+        # Inside transaction() every repository call on this thread shares
+        # the same connection so their writes land in one commit.
+        batch_conn = getattr(self._local, "batch_conn", None)
+        if batch_conn is not None:
+            return batch_conn
+
         # If memory, we must reuse the same connection or it will be wiped
-        # But here we return a new connection each time.
-        # For :memory:, this is fatal - each connection is a fresh empty DB.
-        
+        # For :memory:, each new connection is a fresh empty DB.
         if str(self.db_path) == ":memory:":
             if not hasattr(self, '_memory_conn'):
-                self._memory_conn = sqlite3.connect(":memory:", check_same_thread=False)
-                self._memory_conn.row_factory = sqlite3.Row
+                self._memory_conn = self._connect(":memory:")
             return self._memory_conn
-            
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+
+        # One connection per thread, opened on first use: reconnecting and
+        # re-running the pragmas cost more than most of the queries.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._connect(self.db_path)
+        return conn
+
+    def close(self):
+        """
+        Closes this thread's connection; the next call opens a new one.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
+            conn.close()
+
+    def _connect(self, path) -> sqlite3.Connection:
+        conn = sqlite3.connect(path, check_same_thread=False, factory=_Connection)
         conn.row_factory = sqlite3.Row
+        # Safe with WAL: only the last commits may be lost on power failure,
+        # the database itself cannot be corrupted.
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        # 64 MiB page cache and 256 MiB of memory-mapped reads
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA mmap_size=268435456")
+        if self._journal_mode:
+            conn.execute(f"PRAGMA journal_mode={self._journal_mode}")
+        elif self._wal:
+            # Checkpoint less often so bursts of writes stay sequential
+            # appends. Unlike journal_mode=WAL this does not persist, so
+            # each thread's connection needs it.
+            conn.execute(f"PRAGMA wal_autocheckpoint={_WAL_AUTOCHECKPOINT}")
         return conn
+
+    @contextmanager
+    def transaction(self):
+        """
+        Groups all repository writes issued on this thread into one commit.
+        Rolls everything back if the block raises.
+        """
+        if getattr(self._local, "batch_conn", None) is not None:
+            # Nested: the outer block owns the commit.
+            yield self._local.batch_conn
+            return
+
+        conn = self.get_connection()
+        conn.deferred = True
+        self._local.batch_conn = conn
+        self._local.on_commit = []
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.deferred = False
+            conn.commit()
+            for callback in self._local.on_commit:
+                callback()
+        finally:
+            conn.deferred = False
+            self._local.batch_conn = None
+            self._local.on_commit = []
+
+    def after_commit(self, callback):
+        """
+        Runs callback once this thread's writes are visible to other
+        connections: right away, or when the open transaction() commits.
+        """
+        if getattr(self._local, "batch_conn", None) is None:
+            callback()
+        else:
+            self._local.on_commit.append(callback)
@@ -1,12 +1,21 @@
 # Copyright (c) 2025 Trae AI. All rights reserved.
 
-from flask import Flask, jsonify, request, render_template
-from flask_apscheduler import APScheduler
-import threading
+from flask import Flask, Response, jsonify, request, render_template
+import hashlib
+import logging
+import os
+import shutil
+import sys
 import time
+import yaml
+from operator import attrgetter
+from concurrent.futures import ThreadPoolExecutor
+from pydantic import ValidationError
 from pathlib import Path
 from ..core.config import Config
 from ..core.models import MediaType, MediaItem, MediaFile
+from ..core.renamer import Renamer
+from ..core.scanner import Scanner
 from ..infrastructure.db.database import Database
 from ..infrastructure.db.repository import MediaRepository, LogRepository, SymlinkRepository
 from ..services.scan_service import ScanService
@@ -14,12 +23,16 @@ from ..services.match_service import MatchService
 from ..services.link_service import LinkService
 from ..services.watch_service import WatchService
 from .task_manager import task_manager
+from .json_provider import FastJSONProvider
+from .schemas import ConfirmRequest, validation_message
+
+# /api/media is polled by the UI; serialized bodies are reused for this long
+# unless the repository reports a write in the meantime.
+_MEDIA_CACHE_TTL = 2.0
 
 class Server:
     def __init__(self, config_path: str = "config.yaml"):
         # Configure logging
-        import logging
-        import sys
         logging.basicConfig(
             level=logging.INFO,
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -27,9 +40,16 @@ class Server:
         )
         self.logger = logging.getLogger("src.server.app")
         
+        self.config_path = config_path
         self.config = Config.load(config_path)
         self.app = Flask(__name__, template_folder="../templates", static_folder="../static")
-        self.scheduler = APScheduler()
+        self.app.json = FastJSONProvider(self.app)
+
+        # Scans, reprocessing and unhide run on a bounded, reused pool
+        workers = getattr(self.config, "max_background_workers", 4)
+        if not isinstance(workers, int) or workers < 1:
+            workers = 4
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="nas-bg")
         
         # Infrastructure
         self.db = Database(Path(self.config.database_path))
@@ -46,6 +66,8 @@ class Server:
         self.media_repo = MediaRepository(self.db)
         self.log_repo = LogRepository(self.db)
         self.symlink_repo = SymlinkRepository(self.db)
+        # status filter -> (built_at, repo version, body, etag)
+        self._media_cache = {}
         
         # Services
         self.link_service = LinkService(self.config, self.media_repo, self.symlink_repo, self.log_repo)
@@ -54,7 +76,6 @@ class Server:
         self.watch_service = WatchService(self.config, self.scan_service, self.media_repo)
         
         self._setup_routes()
-        self._setup_scheduler()
         
         # Start Watcher
         self.watch_service.start()
@@ -67,90 +88,56 @@ class Server:
         @self.app.route("/api/media")
         def get_media():
             status_filter = request.args.get("status")
-            mappings = self.media_repo.get_all(status_filter)
-            return jsonify(mappings)
+            body, etag = self._media_body(status_filter)
+            response = Response(body, mimetype="application/json")
+            response.set_etag(etag)
+            return response.make_conditional(request)
 
         @self.app.route("/api/scan", methods=["POST"])
         def trigger_scan():
             task_id = "full_scan"
-            if task_manager.get_task_status(task_id) and task_manager.get_task_status(task_id)["status"] == "running":
+            if not self._start_task(task_id, self.scan_service.run_full_scan, "Scan complete"):
                 return jsonify({"error": "Scan already in progress"}), 400
-            
-            def run_scan():
-                task_manager.start_task(task_id)
-                try:
-                    self.scan_service.run_full_scan(lambda p, m: task_manager.update_progress(task_id, p, m))
-                    task_manager.complete_task(task_id, "Scan complete")
-                except Exception as e:
-                    task_manager.fail_task(task_id, str(e))
-
-            thread = threading.Thread(target=run_scan)
-            thread.start()
             return jsonify({"task_id": task_id})
 
         @self.app.route("/api/scan/incremental", methods=["POST"])
         def trigger_incremental_scan():
             task_id = "incremental_scan"
-            if task_manager.get_task_status(task_id) and task_manager.get_task_status(task_id)["status"] == "running":
+            if not self._start_task(task_id, self.scan_service.run_incremental_scan, "Incremental scan complete"):
                 return jsonify({"error": "Scan already in progress"}), 400
-            
-            def run_inc_scan():
-                task_manager.start_task(task_id)
-                try:
-                    self.scan_service.run_incremental_scan(lambda p, m: task_manager.update_progress(task_id, p, m))
-                    task_manager.complete_task(task_id, "Incremental scan complete")
-                except Exception as e:
-                    task_manager.fail_task(task_id, str(e))
-
-            thread = threading.Thread(target=run_inc_scan)
-            thread.start()
             return jsonify({"task_id": task_id})
 
         @self.app.route("/api/reprocess", methods=["POST"])
         def trigger_reprocess():
             task_id = "reprocess_unknown"
-            if task_manager.get_task_status(task_id) and task_manager.get_task_status(task_id)["status"] == "running":
-                return jsonify({"error": "Reprocess already in progress"}), 400
             
-            def run_reprocess():
-                task_manager.start_task(task_id)
-                try:
-                    # Get all unknown/uncertain and anything previously linked into Unknown
-                    unknowns = self.media_repo.get_all("not_found")
-                    uncertains = self.media_repo.get_all("uncertain")
-                    pendings = self.media_repo.get_all("pending")
-                    unknown_linked = []
-                    with self.db.get_connection() as conn:
-                        cursor = conn.execute(
-                            """
-                            SELECT original_path FROM media_mapping
-                            WHERE media_type = 'Unknown'
-                               OR target_path LIKE 'Unknown/%'
-                               OR target_path LIKE '%/Unknown/%'
-                            """
-                        )
-                        unknown_linked = [{"original_path": row["original_path"]} for row in cursor.fetchall()]
-
-                    all_items = unknowns + uncertains + pendings + unknown_linked
-                    
-                    if not all_items:
-                        task_manager.complete_task(task_id, "No items to reprocess")
-                        return
+            def run_reprocess(update_progress):
+                # Get all unknown/uncertain/pending and anything previously linked into Unknown
+                paths = set(self.media_repo.get_paths_by_status(["not_found", "uncertain", "pending"]))
+                with self.db.get_connection() as conn:
+                    cursor = conn.execute(
+                        """
+                        SELECT original_path FROM media_mapping
+                        WHERE media_type = 'Unknown'
+                           OR target_path LIKE 'Unknown/%'
+                           OR target_path LIKE '%/Unknown/%'
+                        """
+                    )
+                    paths.update(row[0] for row in cursor)
 
-                    paths = sorted({item["original_path"] for item in all_items if item.get("original_path")})
-                    task_manager.update_progress(task_id, 0, f"Reprocessing {len(paths)} items...")
-                    
-                    # We can use scan_service.process_paths but we want progress updates
-                    # scan_service.process_paths doesn't report progress via callback yet.
-                    # For now, just call it. It logs to DB.
-                    self.scan_service.process_paths(paths)
-                    
-                    task_manager.complete_task(task_id, "Reprocess complete")
-                except Exception as e:
-                    task_manager.fail_task(task_id, str(e))
+                paths = sorted(path for path in paths if path)
+                if not paths:
+                    return "No items to reprocess"
 
-            thread = threading.Thread(target=run_reprocess)
-            thread.start()
+                update_progress(0, f"Reprocessing {len(paths)} items...")
+                
+                # We can use scan_service.process_paths but we want progress updates
+                # scan_service.process_paths doesn't report progress via callback yet.
+                # For now, just call it. It logs to DB.
+                self.scan_service.process_paths(paths)
+
+            if not self._start_task(task_id, run_reprocess, "Reprocess complete"):
+                return jsonify({"error": "Reprocess already in progress"}), 400
             return jsonify({"task_id": task_id})
 
         @self.app.route("/api/reset", methods=["POST"])
@@ -163,36 +150,16 @@ class Server:
                     conn.execute("DELETE FROM media_mapping")
                     conn.execute("DELETE FROM symlink_map")
                     conn.execute("DELETE FROM operation_logs")
+                self.media_repo.mark_changed()
                 
                 # 2. Delete all symlinks in target directory
                 target_dir = self.config.target_dir
                 if target_dir.exists():
-                    import shutil
-                    for item in target_dir.iterdir():
-                        if item.is_dir():
-                            shutil.rmtree(item)
-                        else:
-                            item.unlink()
+                    self._clear_target_dir(target_dir)
                     (target_dir / "Movies").mkdir(exist_ok=True)
                     (target_dir / "TV Shows").mkdir(exist_ok=True)
                 
                 self.logger.warning("[User Action] System reset triggered! Clearing DB and Symlinks.")
-                
-                # Double check cleanup: remove any dangling symlinks in target_dir recursively
-                # This helps remove invalid links like 'log' file if they exist
-                if target_dir.exists():
-                     for item in target_dir.rglob('*'):
-                         if item.is_symlink():
-                             try:
-                                 # If link is broken or points to invalid file type
-                                 target = item.resolve()
-                                 if not target.exists():
-                                     item.unlink()
-                                 elif target.is_file() and target.suffix.lower() not in self.config.video_extensions:
-                                      self.logger.warning(f"Removing invalid symlink: {item} -> {target}")
-                                      item.unlink()
-                             except Exception as e:
-                                 pass
 
                 return jsonify({"status": "success"})
             except Exception as e:
@@ -202,6 +169,12 @@ class Server:
         def get_status():
             return jsonify(task_manager.get_all_tasks())
 
+        @self.app.route("/api/status/<task_id>/cancel", methods=["POST"])
+        def cancel_task(task_id):
+            if not task_manager.cancel(task_id):
+                return jsonify({"error": "Task is not queued"}), 400
+            return jsonify({"status": "cancelled"})
+
         @self.app.route("/api/search", methods=["GET"])
         def manual_search():
             name = request.args.get("name")
@@ -234,15 +207,25 @@ class Server:
                 if new_key == "********":
                     data["tmdb_api_key"] = self.config.tmdb_api_key
                 
-                import yaml
-                with open("config.yaml", "r", encoding="utf-8") as f:
+                with open(self.config_path, "r", encoding="utf-8") as f:
                     raw_cfg = yaml.safe_load(f)
                 
                 raw_cfg.update(data)
-                with open("config.yaml", "w", encoding="utf-8") as f:
+                # Validate before touching the file, and build the new Config
+                # from the merged dict instead of parsing it back from disk
+                try:
+                    new_config = Config(**raw_cfg)
+                except ValidationError as e:
+                    return jsonify({"error": validation_message(e)}), 400
+
+                # Write a sibling temp file and rename it over the original,
+                # so an interrupted save never leaves a truncated config
+                tmp_path = f"{self.config_path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
                     yaml.safe_dump(raw_cfg, f, allow_unicode=True)
+                os.replace(tmp_path, self.config_path)
                 
-                self.config = Config.load("config.yaml")
+                self.config = new_config
                 # Update WatchService config
                 if hasattr(self, 'watch_service'):
                     self.watch_service.config = self.config
@@ -258,11 +241,17 @@ class Server:
             # Use repo
             # We need count methods in repo
             # For now direct query is fine as it's efficient
+            # One pass over the table instead of four COUNT(*) queries
             with self.db.get_connection() as conn:
-                total = conn.execute("SELECT COUNT(*) FROM media_mapping").fetchone()[0]
-                matched = conn.execute("SELECT COUNT(*) FROM media_mapping WHERE search_status = 'found'").fetchone()[0]
-                uncertain = conn.execute("SELECT COUNT(*) FROM media_mapping WHERE search_status = 'uncertain'").fetchone()[0]
-                failed = conn.execute("SELECT COUNT(*) FROM media_mapping WHERE search_status = 'not_found'").fetchone()[0]
+                total, matched, uncertain, failed = conn.execute(
+                    """
+                    SELECT COUNT(*),
+                           COALESCE(SUM(search_status = 'found'), 0),
+                           COALESCE(SUM(search_status = 'uncertain'), 0),
+                           COALESCE(SUM(search_status = 'not_found'), 0)
+                    FROM media_mapping
+                    """
+                ).fetchone()
             
             return jsonify({
                 "total": total,
@@ -273,54 +262,44 @@ class Server:
 
         @self.app.route("/api/confirm", methods=["POST"])
         def confirm_selection():
-            data = request.json
-            original_path = Path(data["original_path"])
-            selection = data["selection"]
-            media_type_str = data.get("type", "Movie")
-            alias = data.get("alias")
-            apply_batch = data.get("apply_batch", False) # New Flag
-
-            tmdb_id_val = selection.get("tmdb_id")
-            if tmdb_id_val is None or tmdb_id_val == "":
-                return jsonify({"error": "tmdb_id is required"}), 400
-            if isinstance(tmdb_id_val, str):
-                if not tmdb_id_val.isdigit():
-                    return jsonify({"error": "tmdb_id must be an integer"}), 400
-                tmdb_id_val = int(tmdb_id_val)
-            if not isinstance(tmdb_id_val, int):
-                return jsonify({"error": "tmdb_id must be an integer"}), 400
+            try:
+                req = ConfirmRequest.model_validate(request.get_json(silent=True) or {})
+            except ValidationError as e:
+                return jsonify({"error": validation_message(e)}), 400
+            original_path = req.original_path
+            selection = req.selection
+            media_type_str = req.type
+            alias = req.alias
+            apply_batch = req.apply_batch # New Flag
+            tmdb_id_val = selection.tmdb_id
             
             media_type = MediaType.MOVIE if media_type_str == "Movie" else MediaType.TV_SHOW
             
             # Type Correction from Selection
             # If searcher returned a different media_type (e.g. via ID lookup fallback), use it.
-            if selection.get("media_type"):
-                new_type_str = selection.get("media_type")
+            if selection.media_type:
+                new_type_str = selection.media_type
                 if new_type_str != media_type_str:
                     self.logger.info(f"[User Action] Type switch detected: {media_type_str} -> {new_type_str}")
                     media_type = MediaType.MOVIE if new_type_str == "Movie" else MediaType.TV_SHOW
             
-            from ..core.scanner import Scanner
-            from ..core.renamer import Renamer
-            # We need MediaFile to wrap single file
-            from ..core.models import MediaFile
-            
             subtitle_extensions = getattr(self.config, "subtitle_extensions", [])
             if not isinstance(subtitle_extensions, (list, tuple, set)):
                 subtitle_extensions = []
             scanner = Scanner(self.config.video_extensions, subtitle_extensions=list(subtitle_extensions))
             
             items_to_process = [] # List of MediaItem
+            # One stat for the branches below instead of one per check
+            is_file = original_path.is_file()
             
             # Logic for Batch Processing
-            if apply_batch and media_type == MediaType.TV_SHOW and original_path.is_file():
+            if apply_batch and media_type == MediaType.TV_SHOW and is_file:
                 parent_dir = original_path.parent
                 
                 # Safety Check: Do not batch scan if parent is source_root
-                # Use resolve() to compare absolute paths
-                if parent_dir.resolve() == self.config.source_dir.resolve():
+                if self._is_source_root(parent_dir):
                     self.logger.warning(f"[User Action] Batch match requested but file is in source root. Falling back to single file match for safety.")
-                    files = [MediaFile(path=original_path, extension=original_path.suffix, size=original_path.stat().st_size if original_path.exists() else 0)]
+                    files = [MediaFile.from_path(original_path)]
                 else:
                     self.logger.info(f"[User Action] Batch match requested. Scanning {parent_dir} for siblings.")
                     files = scanner.scan(parent_dir)
@@ -332,7 +311,7 @@ class Server:
                 
                 # Sort files by name to ensure sequential processing
                 # This is CRITICAL for cases where S/E detection fails and we fallback to sequential assignment
-                files.sort(key=lambda f: f.path.name)
+                files.sort(key=attrgetter("path.name"))
                 
                 for index, file in enumerate(files):
                     # Create a temporary item for classification
@@ -360,15 +339,15 @@ class Server:
                     # Override Metadata with User Selection
                     classified_item.media_type = media_type # Force correct type (Classifier defaults single files to Movie)
                     classified_item.tmdb_id = tmdb_id_val
-                    classified_item.title_cn = selection.get("title_cn")
-                    classified_item.title_en = selection.get("title_en")
-                    classified_item.year = selection.get("year") or classified_item.year
+                    classified_item.title_cn = selection.title_cn
+                    classified_item.title_en = selection.title_en
+                    classified_item.year = selection.year or classified_item.year
                     classified_item.alias = alias
                     classified_item.search_status = "found"
                     
                     items_to_process.append(classified_item)
                     
-            elif apply_batch and media_type == MediaType.MOVIE and original_path.is_file():
+            elif apply_batch and media_type == MediaType.MOVIE and is_file:
                  # Similar logic for movies? User usually puts movies in folders too.
                  # But movies don't have S/E.
                  # If user says "This folder is Matrix", maybe it has "Matrix.mp4" and "Matrix-Trailer.mp4".
@@ -378,8 +357,8 @@ class Server:
                  
                  # Let's implement it similar to TV Show: Apply same ID to all files.
                  parent_dir = original_path.parent
-                 if parent_dir.resolve() == self.config.source_dir.resolve():
-                    files = [MediaFile(path=original_path, extension=original_path.suffix, size=original_path.stat().st_size if original_path.exists() else 0)]
+                 if self._is_source_root(parent_dir):
+                    files = [MediaFile.from_path(original_path)]
                  else:
                     files = scanner.scan(parent_dir)
 
@@ -389,18 +368,18 @@ class Server:
                         original_path=file.path,
                         files=[file],
                         media_type=MediaType.MOVIE,
-                        title_cn=selection.get("title_cn"),
-                        title_en=selection.get("title_en"),
+                        title_cn=selection.title_cn,
+                        title_en=selection.title_en,
                         tmdb_id=tmdb_id_val,
-                        year=selection.get("year"),
+                        year=selection.year,
                         alias=alias,
                         search_status="found"
                     )
                     items_to_process.append(item)
             else:
                 # Single file or Directory path (Legacy/Standard mode)
-                files_to_process = scanner.scan(original_path) if original_path.is_dir() else [
-                    MediaFile(path=original_path, extension=original_path.suffix, size=original_path.stat().st_size if original_path.exists() else 0)
+                files_to_process = scanner.scan(original_path) if not is_file and original_path.is_dir() else [
+                    MediaFile.from_path(original_path)
                 ]
                 
                 # For single match, we bundle them into ONE item (e.g. CD1+CD2)?
@@ -417,10 +396,10 @@ class Server:
                     original_path=original_path,
                     files=files_to_process,
                     media_type=media_type,
-                    title_cn=selection.get("title_cn"),
-                    title_en=selection.get("title_en"),
+                    title_cn=selection.title_cn,
+                    title_en=selection.title_en,
                     tmdb_id=tmdb_id_val,
-                    year=selection.get("year"),
+                    year=selection.year,
                     alias=alias,
                     search_status="found"
                 )
@@ -438,8 +417,8 @@ class Server:
                     item = self.scan_service.classifier.classify(item)
                     # Re-apply selection in case classify overwrote them (it shouldn't overwrite if not found, but safety)
                     item.tmdb_id = tmdb_id_val
-                    item.title_cn = selection.get("title_cn")
-                    item.title_en = selection.get("title_en")
+                    item.title_cn = selection.title_cn
+                    item.title_en = selection.title_en
                     # item.year = ...
                 
                 items_to_process.append(item)
@@ -448,17 +427,19 @@ class Server:
             processed_count = 0
             renamer = Renamer()
             
+            # Mappings of all files are replaced with two executemany calls
+            # in one commit. Links are made after it, so the write lock is
+            # not held while symlinks are created on the share.
+            rows = []
+            links = []
+            now = time.time()
             for item in items_to_process:
                 suggested_mappings = []
                 for file in item.files:
                     suggested_path = renamer.get_suggested_path(item, file)
                     suggested_mappings.append((file, suggested_path))
                     processed_count += 1
-                
-                # Update DB
-                for file, suggested_path in suggested_mappings:
-                    self.media_repo.delete_by_path(file.path)
-                    self.media_repo.save({
+                    rows.append({
                         "original_path": str(file.path),
                         "target_path": str(suggested_path),
                         "media_type": item.media_type.value,
@@ -468,19 +449,27 @@ class Server:
                         "year": item.year,
                         "alias": item.alias,
                         "search_status": item.search_status,
-                        "last_scanned_at": time.time()
+                        "last_scanned_at": now
                     })
-                
-                # Link
+                links.append((item, suggested_mappings))
+
+            with self.db.transaction():
+                # Update DB
+                self.media_repo.delete_many([row["original_path"] for row in rows])
+                self.media_repo.save_many(rows)
+
+            # Link
+            for item, suggested_mappings in links:
                 self.link_service.link_item(item, suggested_mappings)
-            
+
             self.logger.info(f"[User Action] Manually matched {processed_count} files (Batch={apply_batch}).")
             
             return jsonify({"status": "success", "processed_count": processed_count})
 
         @self.app.route("/api/logs")
         def get_logs():
-            logs = self.log_repo.get_recent(limit=100)
+            since_id = request.args.get("since_id", type=int)
+            logs = self.log_repo.get_recent(limit=100, since_id=since_id)
             return jsonify(logs)
 
         @self.app.route("/api/media/hide", methods=["POST"])
@@ -542,30 +531,107 @@ class Server:
                 # Let's spawn a quick process thread for just this item.
                 def reprocess_one():
                     try:
-                        from src.core.models import MediaFile
-                        mf = MediaFile(
-                            path=original_path,
-                            extension=original_path.suffix.lower(),
-                            size=original_path.stat().st_size if original_path.exists() else 0,
-                            mtime=original_path.stat().st_mtime if original_path.exists() else 0
-                        )
+                        mf = MediaFile.from_path(original_path, original_path.suffix.lower())
                         self.scan_service.process_paths([mf])
                     except Exception as e:
                         print(f"Error reprocessing unhidden item: {e}")
 
-                threading.Thread(target=reprocess_one).start()
+                self._submit(reprocess_one)
                 
                 return jsonify({"status": "success"})
             except Exception as e:
                 return jsonify({"error": str(e)}), 500
 
-    def _setup_scheduler(self):
-        self.scheduler.init_app(self.app)
-        # Scheduled full scan removed in favor of WatchService polling
-        self.scheduler.start()
+    def _is_source_root(self, path: Path) -> bool:
+        """
+        True if path is config.source_dir, compared by (st_dev, st_ino) so
+        symlinks and bind mounts don't matter. Both sides are stat'ed on
+        every call: a remount of the share changes the source root's ids.
+        """
+        try:
+            return os.path.samefile(path, self.config.source_dir)
+        except OSError:
+            return False
+
+    def _media_body(self, status_filter):
+        """
+        Returns the serialized /api/media body and its ETag, rebuilding them
+        only after a repository write or once the TTL has passed.
+        """
+        now = time.monotonic()
+        # Read the version before querying: a write landing mid-query then
+        # leaves this entry stale rather than caching old rows as current.
+        version = self.media_repo.version
+        cached = self._media_cache.get(status_filter)
+        if cached and cached[1] == version and now - cached[0] < _MEDIA_CACHE_TTL:
+            return cached[2], cached[3]
+
+        body = self.app.json.dumps(self.media_repo.get_all(status_filter), separators=(",", ":"))
+        etag = hashlib.md5(body.encode("utf-8")).hexdigest()
+        self._media_cache[status_filter] = (now, version, body, etag)
+        return body, etag
+
+    @staticmethod
+    def _clear_target_dir(target_dir: Path):
+        """
+        Empties target_dir. DirEntry types come from the directory listing,
+        and symlinks to directories are unlinked rather than followed, so
+        nothing outside target_dir is touched.
+        """
+
+        def split(dir_path):
+            # Unlinks the files and symlinks in dir_path, returns its subdirectories
+            subdirs = []
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    else:
+                        os.unlink(entry.path)
+            return subdirs
+
+        # The top level is just "Movies" and "TV Shows", so the per-title
+        # folders one level down are removed in parallel instead.
+        parents = split(target_dir)
+        subtrees = [path for parent in parents for path in split(parent)]
+        if subtrees:
+            with ThreadPoolExecutor(max_workers=min(8, len(subtrees)), thread_name_prefix="nas-reset") as pool:
+                list(pool.map(shutil.rmtree, subtrees))
+        for parent in parents:
+            os.rmdir(parent)
+
+    def _submit(self, fn):
+        """
+        Runs fn in the background. All background work goes through here.
+        """
+        return self.executor.submit(fn)
+
+    def _start_task(self, task_id: str, work, done_message: str) -> bool:
+        """
+        Runs work(update_progress) in the background as a tracked task.
+        work may return a message to complete the task with instead of
+        done_message. Returns False if the task is already running.
+        """
+        # Checked and marked running atomically, so of two concurrent
+        # requests only one submits the task
+        if not task_manager.try_start(task_id):
+            return False
+
+        def run():
+            try:
+                message = work(lambda p, m: task_manager.update_progress(task_id, p, m))
+                task_manager.complete_task(task_id, message or done_message)
+            except Exception as e:
+                task_manager.fail_task(task_id, str(e))
+
+        task_manager.attach_future(task_id, self._submit(run))
+        return True
 
     def run(self):
-        self.app.run(host=self.config.server_host, port=self.config.server_port)
+        try:
+            self.app.run(host=self.config.server_host, port=self.config.server_port)
+        finally:
+            self.executor.shutdown(wait=True)
 
 if __name__ == "__main__":
     server = Server()
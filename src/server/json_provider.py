@@ -0,0 +1,26 @@
+# Copyright (c) 2025 Trae AI. All rights reserved.
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider for the API responses.
+    Encodes with orjson when it is installed, otherwise with the stdlib
+    encoder minus key sorting and ASCII escaping, which clients don't need.
+    """
+
+    ensure_ascii = False
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs) -> str:
+        # orjson output is always compact; anything else (e.g. indent in
+        # debug mode) goes through the stdlib encoder.
+        if orjson is None or set(kwargs) - {"separators"}:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
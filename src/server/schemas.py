@@ -0,0 +1,42 @@
+# Copyright (c) 2025 Trae AI. All rights reserved.
+
+from pathlib import Path
+from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+
+
+class Selection(BaseModel):
+    """
+    The search candidate the user picked. Unknown keys are kept.
+    """
+
+    model_config = ConfigDict(extra="allow")
+
+    # Accepts ints and digit strings, as the search results and older UIs send either
+    tmdb_id: int = Field(gt=0)
+    title_cn: Optional[str] = None
+    title_en: Optional[str] = None
+    year: Optional[int] = None
+    media_type: Optional[str] = None
+
+
+class ConfirmRequest(BaseModel):
+    """
+    Body of POST /api/confirm.
+    """
+
+    original_path: Path
+    selection: Selection
+    type: str = "Movie"
+    alias: Optional[str] = None
+    apply_batch: bool = False
+
+
+def validation_message(error: ValidationError) -> str:
+    """
+    Short message for the first validation error, e.g.
+    "selection.tmdb_id: Field required".
+    """
+    first = error.errors()[0]
+    location = ".".join(str(part) for part in first["loc"])
+    return f"{location}: {first['msg']}" if location else first["msg"]
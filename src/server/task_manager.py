@@ -1,9 +1,13 @@
 # Copyright (c) 2025 Trae AI. All rights reserved.
 
 import threading
+from concurrent.futures import Future
 from typing import Dict, Any, Optional
 import time
 
+# Minimum gap between progress updates that only change the message
+_PROGRESS_INTERVAL = 0.1
+
 
 class TaskManager:
     """
@@ -11,46 +15,110 @@ class TaskManager:
     """
 
     def __init__(self):
+        # Copy-on-write: entries and the mapping itself are never mutated once
+        # published, only replaced. Readers take no lock and always see a
+        # consistent snapshot; the lock just orders concurrent writers.
         self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._futures: Dict[str, Future] = {}
+        self._last_update: Dict[str, float] = {}
         self._lock = threading.Lock()
 
+    def _replace(self, task_id: str, entry: Dict[str, Any]):
+        # Caller holds self._lock
+        tasks = dict(self._tasks)
+        tasks[task_id] = entry
+        self._tasks = tasks
+
+    def _update(self, task_id: str, **fields):
+        with self._lock:
+            entry = self._tasks.get(task_id)
+            if entry is not None:
+                self._replace(task_id, {**entry, **fields})
+
+    def _start(self, task_id: str, total_steps: int):
+        # Caller holds self._lock
+        self._last_update.pop(task_id, None)
+        self._replace(task_id, {
+            "status": "running",
+            "progress": 0,
+            "total": total_steps,
+            "message": "Starting...",
+            "start_time": time.time(),
+        })
+
     def start_task(self, task_id: str, total_steps: int = 100):
         with self._lock:
-            self._tasks[task_id] = {
-                "status": "running",
-                "progress": 0,
-                "total": total_steps,
-                "message": "Starting...",
-                "start_time": time.time(),
-            }
+            self._start(task_id, total_steps)
 
-    def update_progress(self, task_id: str, progress: int, message: Optional[str] = None):
+    def try_start(self, task_id: str, total_steps: int = 100) -> bool:
+        """
+        Starts the task unless it is already running; the check and the
+        start happen under one lock, so only one of two callers succeeds.
+        """
         with self._lock:
-            if task_id in self._tasks:
-                self._tasks[task_id]["progress"] = progress
-                if message:
-                    self._tasks[task_id]["message"] = message
+            entry = self._tasks.get(task_id)
+            if entry is not None and entry["status"] == "running":
+                return False
+            self._start(task_id, total_steps)
+            return True
+
+    def update_progress(self, task_id: str, progress: int, message: Optional[str] = None):
+        # Scans report once per item while the UI polls once a second, so
+        # message-only updates are coalesced. A new percentage always shows.
+        entry = self._tasks.get(task_id)
+        if entry is None:
+            return
+        now = time.monotonic()
+        if progress == entry["progress"] and now - self._last_update.get(task_id, 0.0) < _PROGRESS_INTERVAL:
+            return
+        self._last_update[task_id] = now
+        if message:
+            self._update(task_id, progress=progress, message=message)
+        else:
+            self._update(task_id, progress=progress)
 
     def complete_task(self, task_id: str, message: str = "Completed"):
         with self._lock:
-            if task_id in self._tasks:
-                self._tasks[task_id]["status"] = "completed"
-                self._tasks[task_id]["progress"] = self._tasks[task_id]["total"]
-                self._tasks[task_id]["message"] = message
+            entry = self._tasks.get(task_id)
+            if entry is not None:
+                self._replace(task_id, {**entry, "status": "completed", "progress": entry["total"], "message": message})
 
     def fail_task(self, task_id: str, message: str):
+        self._update(task_id, status="failed", message=message)
+
+    def attach_future(self, task_id: str, future: Future):
+        """
+        Remembers the Future running a task so it can be cancelled.
+        """
         with self._lock:
-            if task_id in self._tasks:
-                self._tasks[task_id]["status"] = "failed"
-                self._tasks[task_id]["message"] = message
+            self._futures[task_id] = future
+        future.add_done_callback(lambda f: self._forget_future(task_id, f))
 
-    def get_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
+    def _forget_future(self, task_id: str, future: Future):
         with self._lock:
-            return self._tasks.get(task_id)
+            if self._futures.get(task_id) is future:
+                del self._futures[task_id]
 
-    def get_all_tasks(self) -> Dict[str, Dict[str, Any]]:
+    def cancel(self, task_id: str) -> bool:
+        """
+        Cancels a task that is still queued. Running tasks cannot be stopped.
+        """
         with self._lock:
-            return self._tasks.copy()
+            future = self._futures.get(task_id)
+        if future is None or not future.cancel():
+            return False
+        self.fail_task(task_id, "Cancelled")
+        return True
+
+    def get_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
+        return self._tasks.get(task_id)
+
+    def is_running(self, task_id: str) -> bool:
+        entry = self._tasks.get(task_id)
+        return entry is not None and entry["status"] == "running"
+
+    def get_all_tasks(self) -> Dict[str, Dict[str, Any]]:
+        return dict(self._tasks)
 
 
 # Global instance
@@ -1,44 +1,122 @@
 # Copyright (c) 2025 Trae AI. All rights reserved.
 
+import logging
+import os
+import re
 import time
 import threading
 from pathlib import Path
 from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
 from watchdog.events import FileSystemEventHandler
-from typing import Callable
+from typing import Callable, Dict
+
+# Event kinds recorded per path; a path seen more than once keeps all of them
+_CREATED = 1
+_MOVED = 2
+_EVENT_LABELS = ((_CREATED, "Created"), (_MOVED, "Moved"))
+
+# Filesystems that don't deliver inotify events for changes made by other hosts
+_NETWORK_FS = {"nfs", "nfs4", "cifs", "smbfs", "smb3", "9p", "afs", "ceph", "glusterfs"}
+_MOUNT_ESCAPE = re.compile(r"\\([0-7]{3})")
+
+
+def _mount_fstype(path: str, mounts_file: str = "/proc/mounts") -> str:
+    """
+    Returns the filesystem type of the mount holding path, or "" if it
+    cannot be told (e.g. no /proc/mounts outside Linux).
+    """
+    try:
+        with open(mounts_file, "r", encoding="utf-8", errors="replace") as f:
+            lines = f.readlines()
+    except OSError:
+        return ""
+
+    path = os.path.realpath(path)
+    best, fstype = "", ""
+    for line in lines:
+        fields = line.split()
+        if len(fields) < 3:
+            continue
+        # Spaces and the like are octal-escaped, e.g. "\040"
+        mount_point = _MOUNT_ESCAPE.sub(lambda m: chr(int(m.group(1), 8)), fields[1])
+        prefix = mount_point.rstrip("/") + "/"
+        if (path == mount_point or path.startswith(prefix)) and len(mount_point) >= len(best):
+            best, fstype = mount_point, fields[2]
+    return fstype
+
+
+def _is_network_fs(path: str) -> bool:
+    fstype = _mount_fstype(path)
+    return fstype in _NETWORK_FS or fstype.startswith("fuse")
 
 
 class SourceDirHandler(FileSystemEventHandler):
     def __init__(self, callback: Callable, debounce_seconds: int = 30):
         self.callback = callback
         self.debounce_seconds = debounce_seconds
-        self.timer = None
         self._lock = threading.Lock()
-        self.changes = set()
+        # path -> OR of event kinds, so repeated events for a file collapse
+        self.changes: Dict[str, int] = {}
+        # One worker thread does the debouncing: an event only pushes the
+        # deadline back instead of starting (and cancelling) a Timer thread.
+        self._deadline = 0.0
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._worker = None
 
     def on_created(self, event):
         if not event.is_directory:
-            self._trigger(f"Created: {event.src_path}")
+            self._trigger(event.src_path, _CREATED)
 
     def on_moved(self, event):
         if not event.is_directory:
-            self._trigger(f"Moved: {event.src_path} -> {event.dest_path}")
+            self._trigger(event.dest_path, _MOVED)
 
-    def _trigger(self, change_desc: str):
+    def _trigger(self, path: str, kind: int):
         with self._lock:
-            self.changes.add(change_desc)
-            if self.timer:
-                self.timer.cancel()
-            self.timer = threading.Timer(self.debounce_seconds, self._execute_callback)
-            self.timer.start()
+            self.changes[path] = self.changes.get(path, 0) | kind
+            self._deadline = time.monotonic() + self.debounce_seconds
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="watcher-debounce", daemon=True)
+                self._worker.start()
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            # Wait until no event has come in for debounce_seconds
+            remaining = self._deadline - time.monotonic()
+            while remaining > 0 and not self._stopped.wait(remaining):
+                remaining = self._deadline - time.monotonic()
+            if self._stopped.is_set():
+                return
+            # This thread serves every later batch, so a failing callback
+            # must not end it
+            try:
+                self._execute_callback()
+            except Exception as e:
+                logging.getLogger(__name__).error(f"Watcher callback failed: {e}")
 
     def _execute_callback(self):
         with self._lock:
-            changes_snapshot = list(self.changes)
-            self.changes.clear()
-            self.timer = None
-        
-        self.callback(changes_snapshot)
+            changes = self.changes
+            self.changes = {}
+
+        # Events that arrived while the last batch was being taken are
+        # already in it; their wake-up finds nothing left to report.
+        if changes:
+            self.callback([self._describe(path, kinds) for path, kinds in changes.items()])
+
+    @staticmethod
+    def _describe(path: str, kinds: int) -> str:
+        labels = "/".join(label for kind, label in _EVENT_LABELS if kinds & kind)
+        return f"{labels}: {path}"
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
 
 
 class FileWatcher:
@@ -46,18 +124,38 @@ class FileWatcher:
     Watches the source directory for new files and triggers a scan.
     """
 
-    def __init__(self, source_dir: str, callback: Callable, debounce_seconds: int = 30):
+    def __init__(
+        self,
+        source_dir: str,
+        callback: Callable,
+        debounce_seconds: int = 30,
+        mode: str = "auto",
+        poll_interval: float = 60,
+    ):
+        """
+        mode: "native" uses the OS notification API (inotify, FSEvents, ...),
+        "polling" rescans every poll_interval seconds, and "auto" polls only
+        when source_dir is on a network mount, where native events from
+        other hosts never arrive.
+        """
         self.source_dir = source_dir
         self.callback = callback
         self.debounce_seconds = debounce_seconds
-        self.observer = Observer()
+        if mode == "auto":
+            mode = "polling" if _is_network_fs(source_dir) else "native"
+        self.mode = mode
+        if mode == "polling":
+            self.observer = PollingObserver(timeout=poll_interval)
+        else:
+            self.observer = Observer()
         self.handler = SourceDirHandler(callback, debounce_seconds)
 
     def start(self):
-        print(f"Starting FileWatcher on {self.source_dir}...")
+        print(f"Starting FileWatcher ({self.mode}) on {self.source_dir}...")
         self.observer.schedule(self.handler, self.source_dir, recursive=True)
         self.observer.start()
 
     def stop(self):
         self.observer.stop()
         self.observer.join()
+        self.handler.stop()
@@ -3,6 +3,7 @@
 from pathlib import Path
 from typing import List, Tuple
 from src.core.models import MediaItem
+from src.core.path_mapping import PathMapper
 from src.infrastructure.db.repository import MediaRepository, SymlinkRepository, LogRepository
 import os
 
@@ -13,6 +14,7 @@ class LinkService:
         self.symlink_repo = symlink_repo
         self.log_repo = log_repo
         self.path_mapping = config.path_mapping
+        self._mapper = None
 
     def link_item(self, item: MediaItem, suggested_mappings: List[Tuple[object, Path]]):
         """
@@ -22,6 +24,8 @@ class LinkService:
         logger = logging.getLogger(__name__)
 
         target_root = self.config.target_dir
+        # All prefixes are matched with one compiled regex
+        mapper = self._mapper = PathMapper.reuse(self._mapper, self.path_mapping)
         
         success_count = 0
         fail_count = 0
@@ -36,12 +40,7 @@ class LinkService:
 
             # Apply path mapping to source
             source_path = file.path
-            target_source = str(source_path)
-            if self.path_mapping:
-                for old_prefix, new_prefix in self.path_mapping.items():
-                    if target_source.startswith(old_prefix):
-                        target_source = target_source.replace(old_prefix, new_prefix, 1)
-                        break
+            target_source = mapper.apply(str(source_path))
             
             try:
                 # Cleanup OLD link if exists
@@ -51,7 +50,8 @@ class LinkService:
                     # If old link is different from new target, remove it
                     # We resolve() to handle potential relative path differences, though they should be absolute.
                     # Safety: check if old_link_path exists to avoid error
-                    if old_link_path.resolve() != full_target_path.resolve():
+                    # An unchanged link (the usual case on rescans) skips both resolves.
+                    if old_link_path != full_target_path and old_link_path.resolve() != full_target_path.resolve():
                         if old_link_path.exists() or old_link_path.is_symlink():
                             try:
                                 old_link_path.unlink()
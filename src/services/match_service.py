@@ -4,14 +4,57 @@ from src.core.searcher import Searcher
 from src.core.models import MediaItem, MediaType
 from src.infrastructure.db.repository import MediaRepository, LogRepository
 import re
+from functools import lru_cache
 from pathlib import Path
 
+# Language tag at the end of a subtitle stem, e.g. "Movie.chs" or "Movie.en"
+_SUBTITLE_LANG = re.compile(r"\.[a-z]{2,3}$", re.IGNORECASE)
+
+
+def _normalize_subtitle_stem(stem: str) -> str:
+    return _SUBTITLE_LANG.sub("", stem)
+
+
+@lru_cache(maxsize=4096)
+def _candidate_stem(path_str: str) -> str:
+    """
+    Normalized stem of a candidate video path; the same found videos are
+    compared against every subtitle in their folder, scan after scan.
+    """
+    return _normalize_subtitle_stem(Path(path_str).stem) if path_str else ""
+
+
 class MatchService:
     def __init__(self, config, media_repo: MediaRepository, log_repo: LogRepository):
         self.config = config
         self.media_repo = media_repo
         self.log_repo = log_repo
         self.searcher = Searcher(config.tmdb_api_key)
+        # (source_dir, source_dir.resolve()), see _source_root()
+        self._source_root_resolved = None
+        # parent_dir -> sibling metadata, see reset_caches()
+        self._sibling_cache = {}
+
+    def reset_caches(self):
+        """
+        Forgets per-scan lookups. Called at the start of every scan so that
+        metadata changed in between (e.g. a manual confirm) is picked up.
+        """
+        self._sibling_cache = {}
+
+    def _source_root(self):
+        """
+        Returns config.source_dir resolved, or None if that fails. Resolved
+        once and reused until the configured path changes.
+        """
+        source_dir = self.config.source_dir
+        cached = self._source_root_resolved
+        if cached is None or cached[0] != source_dir:
+            try:
+                cached = self._source_root_resolved = (source_dir, source_dir.resolve())
+            except Exception:
+                return None
+        return cached[1]
 
     def process_item(self, item: MediaItem) -> MediaItem:
         """
@@ -53,30 +96,32 @@ class MatchService:
             f.extension.lower() in subtitle_exts for f in item.files
         )
 
-        if is_subtitle_only and not item.tmdb_id:
+        # The subtitle and sibling shortcuts below are both skipped for files
+        # directly in the source root; resolve the parent once for both.
+        item_parent = None
+        source_root = None
+        if (is_subtitle_only and not item.tmdb_id) or item.media_type == MediaType.TV_SHOW:
+            source_root = self._source_root()
             try:
                 item_parent = item.original_path.parent.resolve()
-                source_root = self.config.source_dir.resolve()
             except Exception:
                 item_parent = None
-                source_root = None
 
+        if is_subtitle_only and not item.tmdb_id:
             if item_parent and source_root and item_parent != source_root:
+                subtitle_stem = _normalize_subtitle_stem(item.original_path.stem)
                 candidates = []
                 try:
-                    candidates = self.media_repo.get_found_in_dir(str(item_parent), limit=50)
+                    candidates = self.media_repo.get_found_in_dir(
+                        str(item_parent), limit=50, stem=subtitle_stem
+                    )
                 except Exception:
                     candidates = []
 
-                def normalize_subtitle_stem(stem: str) -> str:
-                    return re.sub(r"\.[a-z]{2,3}$", "", stem, flags=re.IGNORECASE)
-
-                subtitle_stem = normalize_subtitle_stem(item.original_path.stem)
                 best = None
                 best_score = 0
                 for c in candidates:
-                    c_path_str = c.get("original_path") or ""
-                    c_stem = normalize_subtitle_stem(Path(c_path_str).stem) if c_path_str else ""
+                    c_stem = _candidate_stem(c.get("original_path") or "")
                     if not c_stem:
                         continue
                     score = 0
@@ -89,6 +134,9 @@ class MatchService:
                     if score > best_score:
                         best = c
                         best_score = score
+                        # Nothing beats an exact stem match
+                        if best_score == 100:
+                            break
 
                 if best and best_score >= 60:
                     item.tmdb_id = best.get("tmdb_id")
@@ -117,21 +165,19 @@ class MatchService:
         is_safe_to_optimize = False
         if item.media_type == MediaType.TV_SHOW:
             # Check if parent is source root
-            # Convert paths to absolute strings for comparison
-            # We assume config.source_dir is absolute
-            try:
-                item_parent = item.original_path.parent.resolve()
-                source_root = self.config.source_dir.resolve()
-                
-                if item_parent != source_root:
-                    is_safe_to_optimize = True
-            except Exception:
-                # If path resolution fails, default to unsafe
-                pass
+            # If path resolution failed, default to unsafe
+            if item_parent is not None and source_root is not None and item_parent != source_root:
+                is_safe_to_optimize = True
         
         if not item.tmdb_id and is_safe_to_optimize:
             parent_dir = str(item.original_path.parent)
-            sibling = self.media_repo.get_sibling_metadata(parent_dir)
+            # Every episode of a season asks for the same folder. Only hits
+            # are kept: a miss turns into a hit once the first episode is saved.
+            sibling = self._sibling_cache.get(parent_dir)
+            if sibling is None:
+                sibling = self.media_repo.get_sibling_metadata(parent_dir)
+                if sibling:
+                    self._sibling_cache[parent_dir] = sibling
             
             if sibling:
                 # Reuse metadata
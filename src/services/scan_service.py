@@ -1,14 +1,21 @@
 # Copyright (c) 2025 Trae AI. All rights reserved.
 
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from src.core.scanner import Scanner
 from src.core.aggregator import Aggregator
 from src.core.classifier import Classifier
 from src.core.renamer import Renamer
+from src.core.path_mapping import PathMapper
 from src.infrastructure.db.repository import MediaRepository, LogRepository
 from .match_service import MatchService
 from .link_service import LinkService
 
+# Scanned files are checked against the DB this many at a time
+_KNOWN_PATHS_BATCH = 500
+
 class ScanService:
     def __init__(self, config, media_repo: MediaRepository, log_repo: LogRepository, 
                  match_service: MatchService, link_service: LinkService):
@@ -17,6 +24,10 @@ class ScanService:
         self.log_repo = log_repo
         self.match_service = match_service
         self.link_service = link_service
+        # PathMapper for config.path_mapping, rebuilt only when it changes
+        self._mapper = None
+        # Matching runs on several threads; saving and linking one at a time
+        self._persist_lock = threading.Lock()
         
         subtitle_extensions = getattr(config, "subtitle_extensions", [])
         if not isinstance(subtitle_extensions, (list, tuple, set)):
@@ -56,12 +67,7 @@ class ScanService:
             # Strict validation: Check existence and extension
             if path_obj.is_file():
                 if path_obj.suffix.lower() in video_exts or path_obj.suffix.lower() in subtitle_exts:
-                    media_files.append(MediaFile(
-                        path=path_obj,
-                        extension=path_obj.suffix.lower(),
-                        size=path_obj.stat().st_size if path_obj.exists() else 0,
-                        mtime=path_obj.stat().st_mtime if path_obj.exists() else 0
-                    ))
+                    media_files.append(MediaFile.from_path(path_obj, path_obj.suffix.lower()))
                 else:
                      # Log warning for debugging user issues
                      print(f"WARNING: Skipping file with invalid extension: {path_obj}")
@@ -72,6 +78,7 @@ class ScanService:
         if not media_files:
             return
 
+        self.match_service.reset_caches()
         self.log_repo.add("SCAN", "PARTIAL", f"Processing {len(media_files)} files")
         
         # Aggregate
@@ -87,51 +94,96 @@ class ScanService:
                 # Continue to next item instead of aborting the whole batch
 
     def _process_single_item(self, item):
+        item = self._classify_and_match(item)
+        with self._persist_lock:
+            self._persist_and_link(item)
+
+    def _classify_and_match(self, item):
         # 1. Classify
         item = self.classifier.classify(item)
         
         # 2. Match
-        item = self.match_service.process_item(item)
-        
+        return self.match_service.process_item(item)
+
+    def _persist_and_link(self, item):
         # 3. Save to DB & Link
+        # All files of the item are saved with one executemany and commit
+        now = time.time()
+        rows = []
         if item.search_status == "found":
             suggested_mappings = []
             for file in item.files:
                 suggested_path = self.renamer.get_suggested_path(item, file)
                 suggested_mappings.append((file, suggested_path))
-                
-                # Save mapping to DB
-                self.media_repo.save({
-                    "original_path": str(file.path),
-                    "target_path": str(suggested_path),
-                    "media_type": item.media_type.value,
-                    "title_cn": item.title_cn,
-                    "title_en": item.title_en,
-                    "tmdb_id": item.tmdb_id,
-                    "year": item.year,
-                    "alias": item.alias,
-                    "search_status": item.search_status,
-                    "last_scanned_at": time.time()
-                })
+                rows.append(self._mapping_row(item, file, str(suggested_path), now))
 
+            self.media_repo.save_many(rows)
             # Link files
             self.link_service.link_item(item, suggested_mappings)
         else:
             # Record unknown/uncertain
             # FIX: Iterate over files instead of saving item.original_path (which might be a directory)
             for file in item.files:
-                self.media_repo.save({
-                    "original_path": str(file.path),
-                    "target_path": None,
-                    "media_type": item.media_type.value,
-                    "title_cn": item.title_cn,
-                    "title_en": item.title_en,
-                    "tmdb_id": item.tmdb_id,
-                    "year": item.year,
-                    "alias": item.alias,
-                    "search_status": item.search_status,
-                    "last_scanned_at": time.time()
-                })
+                rows.append(self._mapping_row(item, file, None, now))
+            self.media_repo.save_many(rows)
+
+    def _match_workers(self) -> int:
+        workers = getattr(self.config, "match_workers", 4)
+        if not isinstance(workers, int) or workers < 1:
+            workers = 4
+        return workers
+
+    def _process_items(self, items, report):
+        """
+        Processes items in order of the list within each folder, with
+        folders running concurrently: matching is mostly TMDB latency. Items
+        of one folder stay on one worker so later episodes still reuse the
+        metadata saved for the first one. Saving and linking are serialized.
+        """
+        groups = {}
+        for item in items:
+            files = item.files
+            # A single-file item groups with its siblings, a folder item by itself
+            is_file_item = len(files) == 1 and files[0].path == item.original_path
+            key = item.original_path.parent if is_file_item else item.original_path
+            groups.setdefault(key, []).append(item)
+
+        total_items = len(items)
+        done = 0
+
+        def run_group(group):
+            nonlocal done
+            for item in group:
+                matched = self._classify_and_match(item)
+                with self._persist_lock:
+                    self._persist_and_link(matched)
+                    # Report progress
+                    report(30 + int((done / total_items) * 60), f"Processing {item.name}...")
+                    done += 1
+
+        workers = min(self._match_workers(), len(groups))
+        if workers <= 1:
+            for group in groups.values():
+                run_group(group)
+            return
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scan-match") as pool:
+            # Re-raises the first failure, like the sequential loop did
+            list(pool.map(run_group, groups.values()))
+
+    @staticmethod
+    def _mapping_row(item, file, target_path, scanned_at):
+        return {
+            "original_path": str(file.path),
+            "target_path": target_path,
+            "media_type": item.media_type.value,
+            "title_cn": item.title_cn,
+            "title_en": item.title_en,
+            "tmdb_id": item.tmdb_id,
+            "year": item.year,
+            "alias": item.alias,
+            "search_status": item.search_status,
+            "last_scanned_at": scanned_at
+        }
 
     def handle_deletion(self, path_str: str):
         """
@@ -161,6 +213,42 @@ class ScanService:
             import logging
             logging.getLogger(__name__).info(f"Deleted from DB: {path_str}")
 
+    def _filter_new_files(self, files, logger):
+        """
+        Returns the files that have no mapping yet, neither under their raw
+        path nor under their path_mapping-mapped path.
+        """
+        raw_paths = [str(f.path) for f in files]
+        mapper = self._mapper = PathMapper.reuse(self._mapper, self.config.path_mapping)
+        # Check which file paths exist in DB (Raw Path)
+        known = self.media_repo.get_known_paths(raw_paths)
+        candidates = []
+        for f, raw_path in zip(files, raw_paths):
+            if raw_path in known:
+                continue
+            # Check if mapped path exists in DB (Handle inconsistency from rebuild_db)
+            candidates.append((f, raw_path, mapper.apply(raw_path)))
+
+        mapped = [m for _, raw_path, m in candidates if m != raw_path]
+        known_mapped = self.media_repo.get_known_paths(mapped) if mapped else set()
+
+        new_files = []
+        for f, raw_path, mapped_path_str in candidates:
+            if mapped_path_str != raw_path and mapped_path_str in known_mapped:
+                existing_mapped = self.media_repo.get_by_path(mapped_path_str)
+                if existing_mapped:
+                    # Found via mapping! 
+                    # Self-healing: Update DB to use raw path for consistency
+                    logger.info(f"Self-healing DB: Updating {f.path.name} from mapped path to raw path.")
+                    existing_mapped["original_path"] = raw_path
+                    # Delete old (mapped) key
+                    self.media_repo.delete_by_path(mapped_path_str)
+                    # Save new (raw) key
+                    self.media_repo.save(existing_mapped)
+                    continue
+            new_files.append(f)
+        return new_files
+
     def run_incremental_scan(self, update_progress=None):
         """
         Executes incremental scan: checks for new files only.
@@ -174,41 +262,19 @@ class ScanService:
 
         try:
             report(10, "Scanning files for incremental update...")
+            self.match_service.reset_caches()
             self.log_repo.add("SCAN", "START", "Incremental scan started")
             logger.info("Starting incremental scan...")
             
-            # 1. Scan all files
-            all_files = self.scanner.scan(self.config.source_dir)
-            
-            # 2. Filter new files
+            # 1. Scan all files and 2. filter new files as they stream in,
+            # looking them up in the DB a batch at a time
             new_files = []
-            for f in all_files:
-                # Check if this file path exists in DB (Raw Path)
-                if self.media_repo.get_by_path(f.path):
-                    continue
-                
-                # Check if mapped path exists in DB (Handle inconsistency from rebuild_db)
-                mapped_path_str = str(f.path)
-                if self.config.path_mapping:
-                    for old_prefix, new_prefix in self.config.path_mapping.items():
-                        if mapped_path_str.startswith(old_prefix):
-                            mapped_path_str = mapped_path_str.replace(old_prefix, new_prefix, 1)
-                            break
-                
-                if mapped_path_str != str(f.path):
-                    existing_mapped = self.media_repo.get_by_path(mapped_path_str)
-                    if existing_mapped:
-                        # Found via mapping! 
-                        # Self-healing: Update DB to use raw path for consistency
-                        logger.info(f"Self-healing DB: Updating {f.path.name} from mapped path to raw path.")
-                        existing_mapped["original_path"] = str(f.path)
-                        # Delete old (mapped) key
-                        self.media_repo.delete_by_path(mapped_path_str)
-                        # Save new (raw) key
-                        self.media_repo.save(existing_mapped)
-                        continue
-
-                new_files.append(f)
+            files = self.scanner.iter_scan(self.config.source_dir)
+            while True:
+                batch = list(islice(files, _KNOWN_PATHS_BATCH))
+                if not batch:
+                    break
+                new_files.extend(self._filter_new_files(batch, logger))
             
             if not new_files:
                 report(100, "No new files found.")
@@ -231,13 +297,7 @@ class ScanService:
                 logger.info(f" - {item.name} ({len(item.files)} files)")
 
             total_items = len(items)
-            for i, item in enumerate(items):
-                # Process item
-                self._process_single_item(item)
-                
-                # Report progress
-                current_progress = 30 + int((i / total_items) * 60)
-                report(current_progress, f"Processing {item.name}...")
+            self._process_items(items, report)
 
             report(100, "Incremental scan complete")
             self.log_repo.add("SCAN", "COMPLETE", f"Incremental processed {total_items} items")
@@ -259,6 +319,7 @@ class ScanService:
 
         try:
             report(10, "Scanning files...")
+            self.match_service.reset_caches()
             self.log_repo.add("SCAN", "START", "Full scan started")
             
             files = self.scanner.scan(self.config.source_dir)
@@ -269,13 +330,7 @@ class ScanService:
             items.sort(key=lambda x: x.earliest_mtime)
             
             total_items = len(items)
-            for i, item in enumerate(items):
-                # Process item
-                self._process_single_item(item)
-                
-                # Report progress
-                current_progress = 30 + int((i / total_items) * 60)
-                report(current_progress, f"Processing {item.name}...")
+            self._process_items(items, report)
 
             report(100, "Scan complete")
             self.log_repo.add("SCAN", "COMPLETE", f"Processed {total_items} items")
@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Dict, Set
 
 from src.core.config import Config
+from src.core.path_mapping import PathMapper
 from src.core.scanner import Scanner
 from src.infrastructure.db.repository import MediaRepository
 from src.services.scan_service import ScanService
@@ -25,6 +26,7 @@ class WatchService:
         self.polling_interval = 60  # seconds
         self.stop_event = threading.Event()
         self.worker_thread = None
+        self._reverse_mapper = None
 
     def start(self):
         """Starts the polling loop in a separate thread."""
@@ -69,8 +71,7 @@ class WatchService:
             subtitle_extensions = []
 
         scanner = Scanner(self.config.video_extensions, subtitle_extensions=list(subtitle_extensions))
-        scanned_files = scanner.scan(source_path)
-        disk_map: Dict[str, object] = {str(f.path): f for f in scanned_files}
+        disk_map: Dict[str, object] = {str(f.path): f for f in scanner.iter_scan(source_path)}
         disk_paths: Set[str] = set(disk_map.keys())
 
         db_records = self.media_repo.get_all()
@@ -79,13 +80,11 @@ class WatchService:
         normalized_db_paths: Set[str] = set()
         normalized_to_db: Dict[str, str] = {}
 
+        # DB paths may be stored mapped; map them back to raw disk paths
+        reverse_mapping = {mapped: raw for raw, mapped in (self.config.path_mapping or {}).items()}
+        mapper = self._reverse_mapper = PathMapper.reuse(self._reverse_mapper, reverse_mapping)
         for p in db_paths:
-            normalized = p
-            if self.config.path_mapping:
-                for raw_prefix, mapped_prefix in self.config.path_mapping.items():
-                    if normalized.startswith(mapped_prefix):
-                        normalized = normalized.replace(mapped_prefix, raw_prefix, 1)
-                        break
+            normalized = mapper.apply(p)
             normalized_db_paths.add(normalized)
             normalized_to_db[normalized] = p
 
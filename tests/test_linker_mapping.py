@@ -48,5 +48,53 @@ class TestLinkerMapping(unittest.TestCase):
         
         mock_symlink.assert_called_with(expected_source, expected_target)
 
+    @patch("os.symlink")
+    def test_link_file_prefers_longest_mapping_prefix(self, mock_symlink):
+        linker = Linker(
+            self.target_dir,
+            self.db_manager,
+            {"/datanas": "/volume1/PT-DATA", "/datanas/Movies": "/volume2/Movies"},
+        )
+        relative_target_path = Path("Movies/TestMovie/movie.mp4")
+
+        linker.link_file(Path("/datanas/Movies/TestMovie/movie.mp4"), relative_target_path, "Movie")
+
+        mock_symlink.assert_called_with(
+            "/volume2/Movies/TestMovie/movie.mp4", self.target_dir / relative_target_path
+        )
+
+    def test_link_item_batches_db_writes(self):
+        from src.core.models import MediaItem, MediaFile, MediaType
+
+        files = [
+            MediaFile(path=Path(f"/other/Show/ep{i}.mkv"), extension=".mkv")
+            for i in (1, 2)
+        ]
+        item = MediaItem(
+            name="Show",
+            original_path=Path("/other/Show"),
+            files=files,
+            media_type=MediaType.TV_SHOW,
+        )
+        mappings = [
+            (f, Path(f"TV Shows/Show/Season 1/{f.path.name}")) for f in files
+        ]
+
+        # A stale, broken link at the first target must be replaced
+        stale = self.target_dir / mappings[0][1]
+        stale.parent.mkdir(parents=True)
+        os.symlink("/nonexistent/old.mkv", stale)
+
+        count = self.linker.link_item(item, mappings)
+
+        self.assertEqual(count, 2)
+        for _, rel in mappings:
+            link = self.target_dir / rel
+            self.assertTrue(link.is_symlink())
+        self.assertEqual(os.readlink(stale), "/other/Show/ep1.mkv")
+        self.db_manager.record_links.assert_called_once()
+        rows = self.db_manager.record_links.call_args[0][0]
+        self.assertEqual([r["original"] for r in rows], [f.path for f in files])
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,171 @@
+# Copyright (c) 2025 Trae AI. All rights reserved.
+
+import pytest
+from src.infrastructure.db.database import Database
+from src.infrastructure.db.repository import MediaRepository
+
+
+def test_transaction_commits_all_writes_together(db_path):
+    db = Database(db_path)
+    repo = MediaRepository(db)
+
+    with db.transaction():
+        repo.save({"original_path": "/src/a.mkv", "search_status": "found"})
+        repo.save({"original_path": "/src/b.mkv", "search_status": "found"})
+        # A separate connection must not see uncommitted rows yet
+        other = Database(db_path)
+        assert MediaRepository(other).get_all() == []
+
+    paths = {row["original_path"] for row in repo.get_all()}
+    assert paths == {"/src/a.mkv", "/src/b.mkv"}
+
+
+def test_transaction_rolls_back_on_error(db_path):
+    db = Database(db_path)
+    repo = MediaRepository(db)
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            repo.save({"original_path": "/src/a.mkv"})
+            raise RuntimeError("boom")
+
+    assert repo.get_all() == []
+
+
+def test_save_many_and_add_many(media_repo, symlink_repo):
+    media_repo.save_many([
+        {"original_path": "/src/a.mkv", "target_path": "/dst/a.mkv", "search_status": "found"},
+        {"original_path": "/src/b.mkv"},
+    ])
+    symlink_repo.add_many([("/src/a.mkv", "/dst/a.mkv")])
+
+    assert media_repo.get_by_path("/src/a.mkv")["target_path"] == "/dst/a.mkv"
+    assert media_repo.get_by_path("/src/b.mkv")["search_status"] == "pending"
+    assert symlink_repo.get_by_source("/src/a.mkv") == "/dst/a.mkv"
+
+    media_repo.delete_many(["/src/a.mkv", "/src/b.mkv"])
+    assert media_repo.get_all() == []
+
+
+def test_file_database_uses_wal(db_path):
+    db = Database(db_path)
+    conn = db.get_connection()
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    finally:
+        db.close()
+
+
+def test_wal_autocheckpoint_applies_to_every_thread(db_path):
+    import threading
+
+    db = Database(db_path)
+    others = []
+    thread = threading.Thread(
+        target=lambda: others.append(
+            db.get_connection().execute("PRAGMA wal_autocheckpoint").fetchone()[0]
+        )
+    )
+    thread.start()
+    thread.join()
+
+    assert db.get_connection().execute("PRAGMA wal_autocheckpoint").fetchone()[0] == 10000
+    assert others == [10000]
+
+
+def test_connection_is_reused_per_thread(db_path):
+    import threading
+
+    db = Database(db_path)
+    conn = db.get_connection()
+    assert db.get_connection() is conn
+
+    others = []
+    thread = threading.Thread(target=lambda: others.append(db.get_connection()))
+    thread.start()
+    thread.join()
+    assert others[0] is not conn
+
+    db.close()
+    assert db.get_connection() is not conn
+
+
+def test_found_in_dir_matches_only_that_directory(media_repo):
+    media_repo.save_many([
+        {"original_path": p, "search_status": "found", "tmdb_id": 1}
+        for p in ["/src/Show/e1.mkv", "/src/Show/S1/e2.mkv", "/src/Show2/e1.mkv", "/src/Show0/e1.mkv"]
+    ])
+
+    paths = {row["original_path"] for row in media_repo.get_found_in_dir("/src/Show")}
+
+    assert paths == {"/src/Show/e1.mkv", "/src/Show/S1/e2.mkv"}
+    assert media_repo.get_sibling_metadata("/src/Show2/")["original_path"] == "/src/Show2/e1.mkv"
+
+
+def test_recent_logs_since_id(log_repo):
+    for i in range(3):
+        log_repo.add("MATCH", f"/src/{i}.mkv")
+
+    logs = log_repo.get_recent()
+    assert [log["target"] for log in logs] == ["/src/2.mkv", "/src/1.mkv", "/src/0.mkv"]
+
+    newer = log_repo.get_recent(since_id=logs[-1]["id"])
+    assert [log["target"] for log in newer] == ["/src/2.mkv", "/src/1.mkv"]
+    assert log_repo.get_recent(since_id=logs[0]["id"]) == []
+
+
+def test_paths_by_status(media_repo):
+    media_repo.save_many([
+        {"original_path": "/src/a.mkv", "search_status": "found"},
+        {"original_path": "/src/b.mkv", "search_status": "uncertain"},
+        {"original_path": "/src/c.mkv", "search_status": "not_found"},
+        {"original_path": "/src/d.mkv"},
+    ])
+
+    paths = media_repo.get_paths_by_status(["not_found", "uncertain", "pending"])
+
+    assert sorted(paths) == ["/src/b.mkv", "/src/c.mkv", "/src/d.mkv"]
+    assert media_repo.get_paths_by_status([]) == []
+
+
+def test_found_in_dir_puts_stem_hint_first(media_repo):
+    media_repo.save_many([
+        {"original_path": f"/src/Show/e{i}.mkv", "search_status": "found", "tmdb_id": 1}
+        for i in range(5)
+    ])
+
+    rows = media_repo.get_found_in_dir("/src/Show", limit=2, stem="e0")
+
+    assert rows[0]["original_path"] == "/src/Show/e0.mkv"
+    assert len(media_repo.get_found_in_dir("/src/Show", stem="")) == 5
+
+
+def test_version_moves_only_once_writes_are_visible(db_path):
+    import threading
+
+    db = Database(db_path)
+    repo = MediaRepository(db)
+
+    def poll():
+        # What a /api/media request on another thread would cache
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append((repo.version, len(repo.get_all()))))
+        thread.start()
+        thread.join()
+        return seen[0]
+
+    with db.transaction():
+        repo.delete_many(["/src/a.mkv"])
+        repo.save_many([{"original_path": "/src/a.mkv", "search_status": "found"}])
+        assert poll() == (0, 0)
+
+    # One bump per write, all applied at the commit
+    assert poll() == (2, 1)
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            repo.save({"original_path": "/src/b.mkv"})
+            raise RuntimeError("boom")
+    assert poll() == (2, 1)
+    repo.save({"original_path": "/src/b.mkv"})
+    assert poll() == (3, 2)
@@ -0,0 +1,90 @@
+# Copyright (c) 2025 Trae AI. All rights reserved.
+
+from src.db.manager import DatabaseManager
+
+
+def test_list_found_returns_linked_found_rows(tmp_path):
+    manager = DatabaseManager(tmp_path / "cli.db")
+    manager.add_mappings([
+        {"original": "/src/a.mkv", "target": "Movies/A/a.mkv", "media_type": "Movie",
+         "title_cn": "A", "tmdb_id": 1, "year": 2000},
+        {"original": "/src/b.mkv", "target": None, "media_type": "Movie",
+         "search_status": "not_found"},
+    ])
+
+    found = manager.list_found()
+
+    assert list(found) == ["/src/a.mkv"]
+    assert found["/src/a.mkv"]["tmdb_id"] == 1
+    assert found["/src/a.mkv"]["media_type"] == "Movie"
+
+
+def test_record_links_keeps_metadata(tmp_path):
+    manager = DatabaseManager(tmp_path / "cli.db")
+    manager.add_mappings([
+        {"original": "/src/a.mkv", "target": "Movies/A/a.mkv", "media_type": "Movie",
+         "title_cn": "A", "tmdb_id": 1, "year": 2000},
+    ])
+
+    manager.record_links([
+        {"original": "/src/a.mkv", "target": "/dst/Movies/A/a.mkv", "media_type": "Movie"},
+        {"original": "/src/b.mkv", "target": "/dst/Movies/B/b.mkv", "media_type": "Movie"},
+    ])
+
+    row = manager.get_mapping("/src/a.mkv")
+    assert (row["target_path"], row["tmdb_id"], row["title_cn"]) == ("/dst/Movies/A/a.mkv", 1, "A")
+    # A link without TMDB data is not a verdict to reuse
+    assert list(manager.list_found()) == ["/src/a.mkv"]
+
+
+def test_link_twice_reuses_only_real_verdicts(tmp_path, monkeypatch):
+    import yaml
+    from typer.testing import CliRunner
+    from src.cli import main
+
+    source = tmp_path / "source"
+    (source / "Movie.2000").mkdir(parents=True)
+    (source / "Movie.2000" / "Movie.2000.mkv").write_bytes(b"x")
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump({
+        "source_dir": str(source),
+        "target_dir": str(tmp_path / "target"),
+        "database_path": str(tmp_path / "cli.db"),
+        "video_extensions": [".mkv"],
+    }))
+
+    searched = []
+
+    class FakeSearcher:
+        def __init__(self, api_key):
+            pass
+
+        def search(self, item):
+            searched.append(item.name)
+            item.title_cn, item.tmdb_id, item.year = "电影", 7, 2000
+            item.search_status = "found"
+            return item
+
+        def extract_season_from_name(self, name):
+            return None
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(main, "Searcher", FakeSearcher)
+    runner = CliRunner()
+
+    def link(*args):
+        result = runner.invoke(main.app, ["link", "--config-path", str(config_path), *args])
+        assert result.exit_code == 0, result.output
+
+    # A link without searching leaves no TMDB data, so the next run searches
+    link("--no-search")
+    link("--search")
+    assert searched == ["Movie.2000"]
+
+    # The linker kept the found metadata, so a third run reuses it
+    link("--search")
+    assert searched == ["Movie.2000"]
+    row = DatabaseManager(tmp_path / "cli.db").get_mapping(source / "Movie.2000" / "Movie.2000.mkv")
+    assert (row["tmdb_id"], row["title_cn"]) == (7, "电影")
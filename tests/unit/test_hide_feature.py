@@ -84,3 +84,138 @@ def test_unhide_media_resets_status_and_triggers_scan(app_server):
         args = app_server.scan_service.process_paths.call_args[0][0]
         assert len(args) == 1
         assert str(args[0].path) == original_path
+
+def test_background_tasks_run_on_the_shared_executor(app_server):
+    from src.server.task_manager import task_manager
+
+    release = threading.Event()
+    app_server.scan_service.run_full_scan = MagicMock(side_effect=lambda progress: release.wait(5))
+
+    with app_server.app.test_client() as client:
+        assert client.post('/api/scan').status_code == 200
+        # Already running: a second request is refused
+        assert client.post('/api/scan').status_code == 400
+        release.set()
+
+    app_server.executor.shutdown(wait=True)
+    assert task_manager.get_task_status("full_scan")["status"] == "completed"
+
+def test_stats_counts_statuses(app_server):
+    with app_server.app.test_client() as client:
+        assert client.get('/api/stats').json == {"total": 0, "matched": 0, "uncertain": 0, "failed": 0}
+
+        app_server.media_repo.save_many([
+            {"original_path": "/tmp/source/a.mp4", "search_status": "found"},
+            {"original_path": "/tmp/source/b.mp4", "search_status": "found"},
+            {"original_path": "/tmp/source/c.mp4", "search_status": "uncertain"},
+            {"original_path": "/tmp/source/d.mp4", "search_status": "not_found"},
+            {"original_path": "/tmp/source/e.mp4", "search_status": "hidden"},
+        ])
+
+        assert client.get('/api/stats').json == {"total": 5, "matched": 2, "uncertain": 1, "failed": 1}
+
+def test_reset_clears_target_without_following_symlinks(app_server, tmp_path):
+    target = tmp_path / "target"
+    outside = tmp_path / "outside"
+    (target / "Movies" / "A (2020)").mkdir(parents=True)
+    (target / "Movies" / "A (2020)" / "a.mp4").symlink_to(tmp_path / "missing.mp4")
+    (target / "stray.txt").write_text("x")
+    outside.mkdir()
+    (outside / "keep.mp4").write_text("x")
+    (target / "linked_dir").symlink_to(outside, target_is_directory=True)
+    app_server.config.target_dir = target
+
+    with app_server.app.test_client() as client:
+        assert client.post('/api/reset').status_code == 200
+
+    assert sorted(p.name for p in target.iterdir()) == ["Movies", "TV Shows"]
+    assert list((target / "Movies").iterdir()) == []
+    assert (outside / "keep.mp4").exists()
+
+def test_media_list_is_cached_until_a_write(app_server):
+    with app_server.app.test_client() as client:
+        app_server.media_repo.save({"original_path": "/tmp/source/a.mp4", "search_status": "found"})
+
+        first = client.get('/api/media')
+        assert [row["original_path"] for row in first.json] == ["/tmp/source/a.mp4"]
+        etag = first.headers["ETag"]
+
+        with patch.object(app_server.media_repo, "get_all") as get_all:
+            again = client.get('/api/media', headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        get_all.assert_not_called()
+
+        app_server.media_repo.save({"original_path": "/tmp/source/b.mp4", "search_status": "found"})
+        changed = client.get('/api/media', headers={"If-None-Match": etag})
+        assert changed.status_code == 200
+        assert len(changed.json) == 2
+        assert client.get('/api/media?status=uncertain').json == []
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_api_json_is_compact_utf8(app_server, use_orjson):
+    from src.server import json_provider
+
+    app_server.media_repo.save({"original_path": "/tmp/source/流浪地球.mp4", "title_cn": "流浪地球"})
+    orjson = json_provider.orjson if use_orjson else None
+    with patch.object(json_provider, "orjson", orjson), app_server.app.test_client() as client:
+        resp = client.get('/api/media')
+
+    assert "流浪地球".encode("utf-8") in resp.data
+    assert b'", "' not in resp.data
+    assert resp.json[0]["title_cn"] == "流浪地球"
+
+def test_task_snapshots_are_not_mutated_by_updates():
+    from src.server.task_manager import TaskManager
+
+    manager = TaskManager()
+    manager.start_task("scan")
+    before = manager.get_task_status("scan")
+    all_before = manager.get_all_tasks()
+    assert manager.is_running("scan")
+
+    manager.update_progress("scan", 40, "Halfway")
+    manager.complete_task("scan", "Done")
+
+    assert (before["progress"], before["status"]) == (0, "running")
+    assert all_before["scan"] is before
+    assert manager.get_task_status("scan") == {**before, "status": "completed", "progress": 100, "message": "Done"}
+    assert not manager.is_running("scan")
+    assert not manager.is_running("missing")
+
+def test_progress_updates_are_throttled_per_percentage():
+    from src.server.task_manager import TaskManager
+
+    manager = TaskManager()
+    manager.start_task("scan")
+    manager.update_progress("scan", 30, "Processing a.mkv...")
+    manager.update_progress("scan", 30, "Processing b.mkv...")
+    assert manager.get_task_status("scan")["message"] == "Processing a.mkv..."
+
+    manager.update_progress("scan", 31, "Processing c.mkv...")
+    assert manager.get_task_status("scan")["message"] == "Processing c.mkv..."
+
+    manager._last_update["scan"] -= 1
+    manager.update_progress("scan", 31, "Processing d.mkv...")
+    assert manager.get_task_status("scan")["message"] == "Processing d.mkv..."
+
+def test_try_start_admits_one_of_concurrent_callers():
+    import threading
+    from src.server.task_manager import TaskManager
+
+    manager = TaskManager()
+    barrier = threading.Barrier(8)
+    results = []
+
+    def start():
+        barrier.wait()
+        results.append(manager.try_start("scan"))
+
+    threads = [threading.Thread(target=start) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(results) == [False] * 7 + [True]
+    manager.complete_task("scan")
+    assert manager.try_start("scan")
@@ -73,12 +73,10 @@ def test_confirm_selection_batch_processing(app_client):
     }
     
     # 3. Mock internal dependencies of the route
-    # The route imports Scanner and Renamer INSIDE the function.
-    # So we cannot patch them on 'src.server.app.Scanner' because they are not module-level attributes.
-    # We must patch where they come from: 'src.core.scanner.Scanner' and 'src.core.renamer.Renamer'
+    # The route uses the Scanner and Renamer imported by src.server.app, so patch them there
     
-    with patch("src.core.scanner.Scanner") as MockScanner, \
-         patch("src.core.renamer.Renamer") as MockRenamer:
+    with patch("src.server.app.Scanner") as MockScanner, \
+         patch("src.server.app.Renamer") as MockRenamer:
              
         # Setup Scanner to return both files when scanned
         scanner_instance = MockScanner.return_value
@@ -126,10 +124,11 @@ def test_confirm_selection_batch_processing(app_client):
         assert data.get("processed_count") == 2
         
         # Verify Repo Calls
-        # save() should be called twice (once for ep1, once for ep2)
-        assert server.media_repo.save.call_count == 2
+        # save_many() should be called once with ep1 and ep2
+        assert server.media_repo.save_many.call_count == 1
         
-        saved_records = [call[0][0] for call in server.media_repo.save.call_args_list]
+        saved_records = server.media_repo.save_many.call_args[0][0]
+        assert len(saved_records) == 2
         paths = [r["original_path"] for r in saved_records]
         assert str(series_dir / "ep1.mkv") in paths
         assert str(series_dir / "ep2.mkv") in paths
@@ -154,8 +153,8 @@ def test_confirm_selection_batch_ignored_in_root(app_client):
         "apply_batch": True
     }
     
-    with patch("src.core.scanner.Scanner") as MockScanner, \
-         patch("src.core.renamer.Renamer") as MockRenamer:
+    with patch("src.server.app.Scanner") as MockScanner, \
+         patch("src.server.app.Renamer") as MockRenamer:
         scanner_instance = MockScanner.return_value
         # If it were to scan, it would find both. 
         # But we expect it NOT to scan root.
@@ -178,8 +177,9 @@ def test_confirm_selection_batch_ignored_in_root(app_client):
         # We need to verify that.
         
         # Check save calls
-        assert server.media_repo.save.call_count == 1
-        saved = server.media_repo.save.call_args[0][0]
+        saved_records = server.media_repo.save_many.call_args[0][0]
+        assert len(saved_records) == 1
+        saved = saved_records[0]
         assert saved["original_path"] == str(source / "root_ep1.mkv")
 
 
@@ -197,4 +197,100 @@ def test_confirm_selection_requires_tmdb_id(app_client):
     response = client.post("/api/confirm", json=payload)
     assert response.status_code == 400
     assert server.media_repo.save.call_count == 0
+    assert server.media_repo.save_many.call_count == 0
     assert server.link_service.link_item.call_count == 0
+
+
+def test_confirm_selection_validates_payload(app_client):
+    client, source, server = app_client
+    (source / "movie.mkv").touch()
+
+    bad_id = {"original_path": str(source / "movie.mkv"), "selection": {"tmdb_id": "12a"}}
+    response = client.post("/api/confirm", json=bad_id)
+    assert response.status_code == 400
+    assert "tmdb_id" in response.json["error"]
+
+    response = client.post("/api/confirm", json={"selection": {"tmdb_id": 1}})
+    assert response.status_code == 400
+    assert "original_path" in response.json["error"]
+
+    assert server.media_repo.save_many.call_count == 0
+    assert server.link_service.link_item.call_count == 0
+
+    digits = {"original_path": str(source / "movie.mkv"), "selection": {"tmdb_id": "603", "title_cn": "黑客帝国"}}
+    assert client.post("/api/confirm", json=digits).status_code == 200
+    assert server.media_repo.save_many.call_args[0][0][0]["tmdb_id"] == 603
+
+
+def test_config_update_is_validated_and_written_atomically(app_client):
+    import yaml
+
+    client, source, server = app_client
+    config_path = Path(server.config_path)
+
+    response = client.post("/api/config", json={"scan_interval_minutes": 5, "tmdb_api_key": "********"})
+    assert response.status_code == 200
+    assert server.config.scan_interval_minutes == 5
+    saved = yaml.safe_load(config_path.read_text(encoding="utf-8"))
+    assert (saved["scan_interval_minutes"], saved["tmdb_api_key"]) == (5, "dummy")
+    assert not Path(f"{config_path}.tmp").exists()
+
+    before = config_path.read_text(encoding="utf-8")
+    response = client.post("/api/config", json={"server_port": "not a port"})
+    assert response.status_code == 400
+    assert config_path.read_text(encoding="utf-8") == before
+    assert server.config.server_port == 5000
+
+
+def test_source_root_check_follows_symlinks(app_client, tmp_path):
+    client, source, server = app_client
+    alias = tmp_path / "alias"
+    alias.symlink_to(source, target_is_directory=True)
+    (source / "Show").mkdir()
+
+    assert server._is_source_root(alias)
+    assert server._is_source_root(source)
+    assert not server._is_source_root(source / "Show")
+    assert not server._is_source_root(tmp_path / "missing")
+
+
+def test_source_root_check_sees_a_remounted_root(app_client, tmp_path):
+    client, source, server = app_client
+    assert server._is_source_root(source)
+
+    # The share comes back as a different directory at the same path
+    source.rename(tmp_path / "old_mount")
+    remounted = tmp_path / "new_mount"
+    remounted.mkdir()
+    source.symlink_to(remounted, target_is_directory=True)
+
+    assert server._is_source_root(remounted)
+    assert not server._is_source_root(tmp_path / "old_mount")
+
+
+def test_confirm_links_after_the_db_commit(app_client):
+    from contextlib import contextmanager
+
+    client, source, server = app_client
+    movie = source / "Movie"
+    movie.mkdir()
+    (movie / "movie.mkv").touch()
+
+    events = []
+
+    @contextmanager
+    def transaction():
+        events.append("begin")
+        yield
+        events.append("commit")
+
+    server.db.transaction = transaction
+    server.link_service.link_item.side_effect = lambda *args: events.append("link")
+
+    response = client.post("/api/confirm", json={
+        "original_path": str(movie / "movie.mkv"),
+        "selection": {"tmdb_id": 1, "title_cn": "电影", "year": 2000},
+    })
+
+    assert response.status_code == 200
+    assert events == ["begin", "commit", "link"]
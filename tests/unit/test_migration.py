@@ -73,13 +73,19 @@ def test_rebuild_script(mock_load_config, MockSymlinkRepo, MockMediaRepo, MockDa
     # Run rebuild
     rebuild_db.rebuild()
     
-    # Verify MediaRepository.save was called
+    # Verify MediaRepository.save_many was called
     mock_media_repo_instance = MockMediaRepo.return_value
-    assert mock_media_repo_instance.save.called
+    assert mock_media_repo_instance.save_many.called
     
     # Verify call args
-    call_args = mock_media_repo_instance.save.call_args[0][0]
+    rows = mock_media_repo_instance.save_many.call_args[0][0]
+    assert len(rows) == 1
+    call_args = rows[0]
     assert call_args["title_cn"] == "Inception"
     assert call_args["year"] == 2010
     assert call_args["tmdb_id"] == 27205
     assert call_args["media_type"] == "Movie"
+
+    # Symlinks are recorded in the same batch
+    links = MockSymlinkRepo.return_value.add_many.call_args[0][0]
+    assert len(links) == 1
@@ -47,3 +47,71 @@ def test_optimization_uses_sibling_metadata():
     # But we can check if it returns early.
     # We can mock searcher if we want, but since we didn't mock it in init, 
     # we rely on the fact that result has tmdb_id set correctly without calling network (mock config has no API key anyway)
+
+
+def test_media_file_from_path_stats_once(tmp_path):
+    from src.core.models import MediaFile
+
+    video = tmp_path / "Movie.MKV"
+    video.write_bytes(b"x" * 10)
+
+    mf = MediaFile.from_path(video)
+    assert (mf.extension, mf.size, mf.mtime) == (".MKV", 10, video.stat().st_mtime)
+    assert MediaFile.from_path(video, ".mkv").extension == ".mkv"
+
+    missing = MediaFile.from_path(tmp_path / "gone.mkv")
+    assert (missing.size, missing.mtime) == (0, 0.0)
+
+
+def test_source_root_is_resolved_once(tmp_path):
+    config = MagicMock()
+    config.source_dir = MagicMock(wraps=tmp_path)
+    config.source_dir.resolve.return_value = tmp_path
+    repo = MagicMock()
+    repo.get_by_path.return_value = None
+    repo.get_sibling_metadata.return_value = {"tmdb_id": 1, "media_type": "TV Show"}
+    service = MatchService(config, repo, MagicMock())
+
+    for name in ["e1.mkv", "e2.mkv", "e3.mkv"]:
+        item = MediaItem(name=name, original_path=tmp_path / "Show" / name, media_type=MediaType.TV_SHOW)
+        assert service.process_item(item).search_status == "found"
+
+    assert config.source_dir.resolve.call_count == 1
+
+    # Files directly in the source root never reuse sibling metadata
+    root_item = MediaItem(name="e4.mkv", original_path=tmp_path / "e4.mkv", media_type=MediaType.TV_SHOW)
+    service.searcher = MagicMock()
+    service.searcher.search.side_effect = lambda item: item
+    service.process_item(root_item)
+    service.searcher.search.assert_called_once()
+
+
+def test_sibling_hits_are_cached_until_reset():
+    config = MagicMock()
+    repo = MagicMock()
+    repo.get_by_path.return_value = None
+    repo.get_sibling_metadata.side_effect = [None, {"tmdb_id": 7, "media_type": "TV Show"}, {"tmdb_id": 8}]
+    service = MatchService(config, repo, MagicMock())
+    service.searcher = MagicMock()
+    service.searcher.search.side_effect = lambda item: item
+
+    def episode(n):
+        return MediaItem(name=f"e{n}.mkv", original_path=Path(f"/mnt/tv/Show/e{n}.mkv"), media_type=MediaType.TV_SHOW)
+
+    # A miss is not cached: the first episode searches, the second finds it saved
+    assert service.process_item(episode(1)).tmdb_id is None
+    assert service.process_item(episode(2)).tmdb_id == 7
+    assert service.process_item(episode(3)).tmdb_id == 7
+    assert repo.get_sibling_metadata.call_count == 2
+
+    service.reset_caches()
+    assert service.process_item(episode(4)).tmdb_id == 8
+
+
+def test_candidate_stem_strips_language_tag():
+    from src.services.match_service import _candidate_stem, _normalize_subtitle_stem
+
+    assert _normalize_subtitle_stem("Movie.2020.chs") == "Movie.2020"
+    assert _normalize_subtitle_stem("Movie.2020") == "Movie.2020"
+    assert _candidate_stem("/src/Movie/Movie.2020.EN.mkv") == "Movie.2020"
+    assert _candidate_stem("") == ""
@@ -112,3 +112,17 @@ def test_watch_service_handles_mapped_db_paths(mock_config):
     # So media_repo.save should NOT be called.
     assert not media_repo.save.called
     assert not media_repo.delete_by_path.called
+
+
+def test_path_mapper_reuse_follows_mapping_changes():
+    from src.core.path_mapping import PathMapper
+
+    mapper = PathMapper.reuse(None, {"/data": "/volume1", "/data/tv": "/volume2/tv"})
+    assert mapper.apply("/data/tv/Show/e1.mkv") == "/volume2/tv/Show/e1.mkv"
+    assert mapper.apply("/data/movies/a.mkv") == "/volume1/movies/a.mkv"
+
+    assert PathMapper.reuse(mapper, {"/data/tv": "/volume2/tv", "/data": "/volume1"}) is mapper
+    changed = PathMapper.reuse(mapper, {"/data": "/volume3"})
+    assert changed is not mapper
+    assert changed.apply("/data/tv/e1.mkv") == "/volume3/tv/e1.mkv"
+    assert PathMapper.reuse(changed, None).apply("/data/a.mkv") == "/data/a.mkv"
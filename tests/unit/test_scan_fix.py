@@ -42,13 +42,13 @@ def test_scan_service_saves_files_not_directory_when_unknown():
     service._process_single_item(item)
     
     # Verify
-    # Should call save 2 times (once for each file)
-    # Should NOT call save with dir_path
+    # Should save both files in one save_many() call
+    # Should NOT save dir_path
     
-    assert media_repo.save.call_count == 2
+    assert media_repo.save_many.call_count == 1
     
-    calls = media_repo.save.call_args_list
-    saved_paths = [c[0][0]['original_path'] for c in calls]
+    saved_paths = [row['original_path'] for row in media_repo.save_many.call_args[0][0]]
+    assert len(saved_paths) == 2
     
     assert str(file1.path) in saved_paths
     assert str(file2.path) in saved_paths
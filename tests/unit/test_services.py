@@ -62,3 +62,74 @@ def test_link_service(media_repo, symlink_repo, log_repo, mock_config):
         # We can't easily check DB here because we are mocking symlink which might raise if dir doesn't exist?
         # But we create parent dir.
         pass
+
+
+def test_incremental_scan_checks_known_paths_in_bulk(media_repo, log_repo, mock_config):
+    from src.services.scan_service import ScanService
+
+    source = mock_config.source_dir
+    (source / "Show").mkdir()
+    for name in ["e1.mkv", "e2.mkv", "e3.mkv"]:
+        (source / "Show" / name).touch()
+    mock_config.path_mapping = {str(source): "/volume1/source"}
+    media_repo.save_many([
+        {"original_path": str(source / "Show" / "e1.mkv"), "search_status": "found"},
+        {"original_path": str(source / "Show" / "e2.mkv"), "search_status": "found"},
+        # Stored under its mapped path by an older rebuild
+        {"original_path": "/volume1/source/Show/e3.mkv", "search_status": "found", "tmdb_id": 7},
+    ])
+    service = ScanService(mock_config, media_repo, log_repo, MagicMock(), MagicMock())
+
+    with patch.object(media_repo, "get_by_path", wraps=media_repo.get_by_path) as get_by_path:
+        service.run_incremental_scan()
+
+    # Only the self-healed file is fetched row by row
+    get_by_path.assert_called_once_with("/volume1/source/Show/e3.mkv")
+    assert media_repo.get_by_path(str(source / "Show" / "e3.mkv"))["tmdb_id"] == 7
+    assert media_repo.get_by_path("/volume1/source/Show/e3.mkv") is None
+    service.match_service.process_item.assert_not_called()
+
+
+def test_get_known_paths_spans_chunks(media_repo):
+    paths = [f"/src/{i}.mkv" for i in range(1200)]
+    media_repo.save_many([{"original_path": p} for p in paths[::2]])
+
+    assert media_repo.get_known_paths(paths + ["/src/0.mkv"]) == set(paths[::2])
+    assert media_repo.get_known_paths([]) == set()
+
+
+def test_scan_matches_folders_concurrently_and_keeps_folder_order(log_repo, mock_config):
+    import threading
+    from src.services.scan_service import ScanService
+
+    mock_config.match_workers = 4
+    source = mock_config.source_dir
+    items = [
+        MediaItem(name=f"{show}{n}", original_path=source / show / f"e{n}.mkv",
+                  files=[MediaFile(path=source / show / f"e{n}.mkv", extension=".mkv")])
+        for n in (1, 2, 3) for show in ("A", "B")
+    ]
+    barrier = threading.Barrier(2, timeout=5)
+    matched = []
+
+    def process_item(item):
+        if item.name.endswith("1"):
+            # Both folders' first episodes must be in flight at the same time
+            barrier.wait()
+        matched.append(item.name)
+        item.search_status = "not_found"
+        return item
+
+    match_service = MagicMock()
+    match_service.process_item.side_effect = process_item
+    service = ScanService(mock_config, MagicMock(), log_repo, match_service, MagicMock())
+    service.classifier = MagicMock()
+    service.classifier.classify.side_effect = lambda item: item
+    progress = []
+
+    service._process_items(items, lambda p, msg: progress.append(p))
+
+    assert [n for n in matched if n.startswith("A")] == ["A1", "A2", "A3"]
+    assert [n for n in matched if n.startswith("B")] == ["B1", "B2", "B3"]
+    assert service.media_repo.save_many.call_count == 6
+    assert progress == sorted(progress) and len(progress) == 6
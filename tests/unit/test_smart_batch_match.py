@@ -87,8 +87,8 @@ def test_cyberpunk_fallback_logic(app_client):
     }
     
     # 3. Mock Scanner to return these files
-    with patch("src.core.scanner.Scanner") as MockScanner, \
-         patch("src.core.renamer.Renamer") as MockRenamer:
+    with patch("src.server.app.Scanner") as MockScanner, \
+         patch("src.server.app.Renamer") as MockRenamer:
              
         scanner_instance = MockScanner.return_value
         # Return files in random order to test sorting
@@ -107,8 +107,8 @@ def test_cyberpunk_fallback_logic(app_client):
         assert response.status_code == 200
         
         # 5. Verify Logic
-        # We expect 3 calls to save()
-        assert server.media_repo.save.call_count == 3
+        # We expect all 3 files in one save_many() call
+        assert len(server.media_repo.save_many.call_args[0][0]) == 3
         
         # Inspect saved records to check if Season/Episode was assigned correctly
         # We need to capture the 'target_path' logic or check how item was constructed.
@@ -0,0 +1,66 @@
+# Copyright (c) 2025 Trae AI. All rights reserved.
+
+import threading
+import time
+from types import SimpleNamespace
+from src.server.watcher import SourceDirHandler
+
+
+def test_events_are_debounced_on_one_worker_thread():
+    batches = []
+    fired = threading.Event()
+
+    def callback(changes):
+        batches.append(sorted(changes))
+        fired.set()
+
+    handler = SourceDirHandler(callback, debounce_seconds=0.2)
+    threads_before = threading.active_count()
+    for name in ["a.mkv", "b.mkv", "a.mkv"]:
+        handler.on_created(SimpleNamespace(is_directory=False, src_path=f"/src/{name}"))
+        time.sleep(0.05)
+    handler.on_moved(SimpleNamespace(is_directory=False, src_path="/tmp/b.part", dest_path="/src/b.mkv"))
+    assert threading.active_count() == threads_before + 1
+
+    assert fired.wait(2)
+    handler.stop()
+    assert batches == [["Created/Moved: /src/b.mkv", "Created: /src/a.mkv"]]
+
+
+def test_polling_is_chosen_for_network_mounts(tmp_path):
+    from src.server import watcher
+
+    mounts = tmp_path / "mounts"
+    mounts.write_text(
+        "/dev/sda1 / ext4 rw 0 0\n"
+        "nas:/volume1 /mnt/nas nfs4 rw 0 0\n"
+        "//nas/media /mnt/my\\040media cifs rw 0 0\n"
+    )
+    assert watcher._mount_fstype("/mnt/nas/TV", str(mounts)) == "nfs4"
+    assert watcher._mount_fstype("/mnt/my media/Movies", str(mounts)) == "cifs"
+    assert watcher._mount_fstype("/mnt/nasty", str(mounts)) == "ext4"
+    assert watcher._mount_fstype("/x", str(tmp_path / "missing")) == ""
+
+    assert watcher.FileWatcher(str(tmp_path), print, mode="polling").observer.__class__ is watcher.PollingObserver
+    assert watcher.FileWatcher(str(tmp_path), print, mode="native").mode == "native"
+
+
+def test_worker_survives_a_failing_callback():
+    batches = []
+    fired = threading.Event()
+
+    def callback(changes):
+        batches.append(changes)
+        fired.set()
+        if len(batches) == 1:
+            raise RuntimeError("scan failed")
+
+    handler = SourceDirHandler(callback, debounce_seconds=0.05)
+    handler.on_created(SimpleNamespace(is_directory=False, src_path="/src/a.mkv"))
+    assert fired.wait(2)
+    fired.clear()
+
+    handler.on_created(SimpleNamespace(is_directory=False, src_path="/src/b.mkv"))
+    assert fired.wait(2)
+    handler.stop()
+    assert batches == [["Created: /src/a.mkv"], ["Created: /src/b.mkv"]]